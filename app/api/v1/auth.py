@@ -1,3 +1,5 @@
+import math
+from datetime import datetime, timezone
 from uuid import uuid4
 
 from fastapi import (
@@ -6,7 +8,6 @@ from fastapi import (
     Cookie,
     Depends,
     HTTPException,
-    Request,
     Response,
     status,
 )
@@ -14,25 +15,51 @@ from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.deps import get_current_user, get_db, get_redis
+from app.core.deps import (
+    CurrentUser,
+    get_current_user,
+    get_db,
+    get_redis,
+    oauth2_scheme,
+    optional_oauth2_scheme,
+)
+from app.core.hasher import password_hasher
+from app.core.rate_limit import RateLimiter, login_key
+from app.core.revocation import revoked_tokens
 from app.core.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
     enforce_password_length,
-    pwd_context,
+    PROFILE_CLAIMS,
+    profile_claims,
 )
-from app.models.user import User
 from app.repositories.users import users_repo
-from app.schemas.auth import UserOut
+from app.schemas.auth import SessionOut, SignUpIn, UserOut
 from app.services import refresh_store
 
 router = APIRouter()
 
+login_rate_limit = RateLimiter("login", key=login_key)
+
+
+@router.post("/signup", status_code=status.HTTP_201_CREATED, response_model=UserOut)
+async def signup(data: SignUpIn, db: AsyncSession = Depends(get_db)):
+    enforce_password_length(data.password)
+    password_hash = await password_hasher.hash(data.password)
+    user = await users_repo.create(
+        db,
+        fullname=data.fullname,
+        email=data.email,
+        password_hash=password_hash,
+    )
+    if not user:
+        raise HTTPException(status.HTTP_409_CONFLICT, "Email already registered")
+    return user
 
-@router.post("/login")
+
+@router.post("/login", dependencies=[Depends(login_rate_limit)])
 async def login(
-    request: Request,
     response: Response,
     db: AsyncSession = Depends(get_db),
     redis: Redis = Depends(get_redis),
@@ -40,34 +67,26 @@ async def login(
     password: str = Body(...),
     return_refresh_in_body: bool = Body(False),
 ):
-    # Rate limit
-    client_ip = request.client.host
-    rl_key = f"rl:login:{email}:{client_ip}"
-    async with redis.pipeline() as pipe:
-        pipe.incr(rl_key)
-        pipe.expire(rl_key, 300)
-        req_count, _ = await pipe.execute()
-
-    if req_count > 5:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Too many login attempts",
-        )
-
     enforce_password_length(password)
     user = await users_repo.get_by_email(db, email=email)
-    if not user or not pwd_context.verify(password, user.hashed_password):
+    if not user or not await password_hasher.verify(password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
 
     jti = str(uuid4())
-    access_token = create_access_token(sub=str(user.id), jti=jti)
-    refresh_token = create_refresh_token(sub=str(user.id), jti=jti)
+    profile = profile_claims(user)
+    access_token = create_access_token(sub=str(user.id), jti=jti, extra=profile)
+    # The first jti of a login names its refresh token family.
+    refresh_token = create_refresh_token(
+        sub=str(user.id), jti=jti, extra={**profile, "fid": jti}
+    )
 
     ttl_sec = settings.REFRESH_TTL_DAYS * 86400
-    await refresh_store.save_refresh(redis, jti, str(user.id), ttl_sec)
+    await refresh_store.save_refresh(
+        redis, jti, str(user.id), ttl_sec, family_id=jti
+    )
 
     resp_body = {
         "access_token": access_token,
@@ -101,18 +120,27 @@ async def refresh(
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid token type")
 
     jti = payload["jti"]
-    if not await refresh_store.exists_refresh(redis, jti):
-        raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Refresh token invalid")
-
-    await refresh_store.delete_refresh(redis, jti)
-
+    family_id = payload.get("fid", jti)
     user_id = payload["sub"]
     new_jti = str(uuid4())
-    new_access = create_access_token(sub=user_id, jti=new_jti)
-    new_refresh = create_refresh_token(sub=user_id, jti=new_jti)
-
     ttl_sec = settings.REFRESH_TTL_DAYS * 86400
-    await refresh_store.save_refresh(redis, new_jti, user_id, ttl_sec)
+    result = await refresh_store.rotate_refresh(
+        redis, jti, new_jti, user_id, family_id, ttl_sec
+    )
+    if result == refresh_store.REUSED:
+        raise HTTPException(
+            status.HTTP_401_UNAUTHORIZED, "Refresh token reuse detected"
+        )
+    if result == refresh_store.REVOKED:
+        raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Refresh token revoked")
+    if result != refresh_store.ROTATED:
+        raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Refresh token invalid")
+
+    profile = {k: payload[k] for k in PROFILE_CLAIMS if k in payload}
+    new_access = create_access_token(sub=user_id, jti=new_jti, extra=profile)
+    new_refresh = create_refresh_token(
+        sub=user_id, jti=new_jti, extra={**profile, "fid": family_id}
+    )
 
     resp_body = {"access_token": new_access, "token_type": "bearer"}
     if settings.REFRESH_IN_COOKIE:
@@ -125,29 +153,92 @@ async def refresh(
     return resp_body
 
 
+def _delete_refresh_cookie(response: Response) -> None:
+    if settings.REFRESH_IN_COOKIE:
+        kwargs = settings.refresh_cookie_kwargs()
+        kwargs.pop("samesite", None) # samesite=none requires secure=True
+        response.delete_cookie("rt", **kwargs)
+
+
+def _timestamp(value: float) -> datetime:
+    return datetime.fromtimestamp(value, timezone.utc)
+
+
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
 async def logout(
     response: Response,
     redis: Redis = Depends(get_redis),
+    access_token: str | None = Depends(optional_oauth2_scheme),
     refresh_token: str | None = Cookie(None, alias="rt"),
     refresh_token_body: str | None = Body(None, embed=True, alias="refresh_token"),
 ):
+    # Access tokens share the jti of the refresh token issued with them, so
+    # either token identifies the access token to revoke.
+    revoke: dict[str, float] = {}
     token_str = refresh_token or refresh_token_body
     if token_str:
         payload = decode_token(token_str, verify_exp=False)
         if payload.get("type") == "refresh":
             jti = payload.get("jti")
             if jti:
-                await refresh_store.delete_refresh(redis, jti)
+                await refresh_store.delete_refresh(redis, jti, payload["sub"])
+                revoke[jti] = payload["iat"] + settings.ACCESS_TTL_MIN * 60
+    if access_token:
+        try:
+            payload = decode_token(access_token)
+        except HTTPException:
+            payload = {}  # already expired or invalid: nothing to revoke
+        if payload.get("type") == "access" and payload.get("jti"):
+            revoke[payload["jti"]] = payload["exp"]
+    await revoked_tokens.revoke_many(redis, revoke)
+
+    _delete_refresh_cookie(response)
+    return None
+
+
+@router.get("/sessions", response_model=list[SessionOut])
+async def sessions(
+    current_user: CurrentUser = Depends(get_current_user),
+    access_token: str = Depends(oauth2_scheme),
+    redis: Redis = Depends(get_redis),
+):
+    current_jti = decode_token(access_token).get("jti")
+    return [
+        SessionOut(
+            id=s["family_id"],
+            issued_at=_timestamp(s["issued_at"]),
+            expires_at=_timestamp(s["expires_at"]),
+            current=s["jti"] == current_jti,
+        )
+        for s in await refresh_store.list_sessions(redis, str(current_user.id))
+    ]
 
-    if settings.REFRESH_IN_COOKIE:
-        kwargs = settings.refresh_cookie_kwargs()
-        kwargs.pop("samesite", None) # samesite=none requires secure=True
-        response.delete_cookie("rt", **kwargs)
 
-    return response
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_all(
+    response: Response,
+    current_user: CurrentUser = Depends(get_current_user),
+    access_token: str = Depends(oauth2_scheme),
+    redis: Redis = Depends(get_redis),
+):
+    revoked = await refresh_store.revoke_sessions(
+        redis, str(current_user.id), settings.REFRESH_TTL_DAYS * 86400
+    )
+    # Each session's latest access token shares its refresh jti. issued_at is
+    # stored within milliseconds of the token's whole-second iat, so ceil()
+    # keeps the denylist entry until the token expires.
+    revoke = {
+        s["jti"]: math.ceil(s["issued_at"]) + settings.ACCESS_TTL_MIN * 60
+        for s in revoked
+    }
+    payload = decode_token(access_token)
+    revoke[payload["jti"]] = payload["exp"]
+    await revoked_tokens.revoke_many(redis, revoke)
+
+    _delete_refresh_cookie(response)
+    return None
 
 
 @router.get("/me", response_model=UserOut)
-async def me(current_user: User = Depends(get_current_user)):
+async def me(current_user: CurrentUser = Depends(get_current_user)):
     return current_user
\ No newline at end of file
@@ -1,74 +1,352 @@
 import uuid
+from dataclasses import dataclass
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user, get_db
-from app.models.user import User
-from app.schemas.post import PostCreate, PostOut, PostUpdate
+from app.core import compression, conditional
+from app.core.config import settings
+from app.core.deps import (
+    CurrentUser,
+    get_current_user,
+    get_db,
+    get_read_db,
+    get_redis,
+)
+from app.core.pagination import decode_cursor
+from app.core.responses import accepts_encoding, dump_response
+from app.db.replicas import read_sessionmaker
+from app.db.session import async_session
+from app.schemas.post import (
+    PostBatchCreate,
+    PostBatchResult,
+    PostCreate,
+    PostIds,
+    PostMultiGet,
+    PostOut,
+    PostPage,
+    PostSummary,
+    PostSummaryPage,
+    PostUpdate,
+)
 from app.services import post as post_service
+from app.services import post_cache, post_export
 
 router = APIRouter()
+# Custom-method routes (/posts:batch) sit outside the /posts prefix.
+actions_router = APIRouter()
+
+post_adapter = TypeAdapter(PostOut)
+post_list_adapter = TypeAdapter(list[PostOut])
+post_page_adapter = TypeAdapter(PostPage)
+summary_list_adapter = TypeAdapter(list[PostSummary])
+summary_page_adapter = TypeAdapter(PostSummaryPage)
+batch_result_adapter = TypeAdapter(PostBatchResult)
+multi_get_adapter = TypeAdapter(PostMultiGet)
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=PostOut)
 async def create_post(
     data: PostCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     post = await post_service.create_post(db, current_user.id, data)
+    if settings.FAST_JSON_RESPONSES:
+        return dump_response(post_adapter, post, status.HTTP_201_CREATED)
     return post
 
 
-@router.get("/", response_model=list[PostOut])
-async def list_posts(
-    db: AsyncSession = Depends(get_db),
+@dataclass
+class PostListQuery:
+    q: str | None
+    skip: int
+    limit: int
+    cursor: str | None
+    view: str
+
+
+def post_list_query(
     q: str | None = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(
+        None,
+        description="Keyset cursor from a previous page's next_cursor. "
+        "Pass an empty value to start cursor paging from the first page.",
+    ),
+    view: Literal["full", "summary"] = Query(
+        "full",
+        description="summary returns an excerpt instead of the full content; "
+        "fetch GET /posts/{post_id} for the body.",
+    ),
+) -> PostListQuery:
+    if cursor is not None and skip:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST, "skip cannot be combined with cursor"
+        )
+    return PostListQuery(q, skip, limit, cursor, view)
+
+
+PostListResponse = list[PostOut] | list[PostSummary] | PostPage | PostSummaryPage
+
+
+async def fetch_post_page(
+    db: AsyncSession, query: PostListQuery, author_id: int | None = None
 ):
-    posts = await post_service.list_posts(db, q, skip, limit)
-    return posts
+    summary = query.view == "summary"
+    if query.cursor is None:
+        return await post_service.list_posts(
+            db, query.q, query.skip, query.limit, summary=summary, author_id=author_id
+        )
+    after = decode_cursor(query.cursor) if query.cursor else None
+    return await post_service.list_posts(
+        db,
+        query.q,
+        0,
+        query.limit,
+        after=after,
+        ranked=False,
+        summary=summary,
+        author_id=author_id,
+    )
+
+
+def post_page_response(
+    request: Request,
+    response: Response,
+    query: PostListQuery,
+    posts,
+    next_cursor: str | None,
+):
+    summary = query.view == "summary"
+    # The page's ETag covers the ids/versions it lists, the response shape
+    # and the next cursor; the query still runs, but an unchanged page is not
+    # re-sent. No Last-Modified: a soft-deleted post drops off the page without
+    # raising max(updated_at), so If-Modified-Since would miss the change.
+    shape = f"{query.view}:{'page' if query.cursor is not None else 'list'}"
+    validators = conditional.validator_headers(
+        conditional.list_etag(posts, f"{shape}:{next_cursor}"), None
+    )
+    if conditional.is_not_modified(request, validators["ETag"], None):
+        return conditional.not_modified(validators)
+    # Offset paging (no cursor) keeps the original list response and exposes
+    # the cursor for the following page in X-Next-Cursor.
+    if query.cursor is None:
+        headers = dict(validators)
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        if settings.FAST_JSON_RESPONSES:
+            adapter = summary_list_adapter if summary else post_list_adapter
+            return dump_response(adapter, posts, headers=headers)
+        response.headers.update(headers)
+        return posts
+
+    page = {"items": posts, "next_cursor": next_cursor}
+    if settings.FAST_JSON_RESPONSES:
+        adapter = summary_page_adapter if summary else post_page_adapter
+        return dump_response(adapter, page, headers=validators)
+    response.headers.update(validators)
+    page_model = PostSummaryPage if summary else PostPage
+    return page_model.model_validate(page, from_attributes=True)
+
+
+@router.get("/", response_model=PostListResponse)
+async def list_posts(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    query: PostListQuery = Depends(post_list_query),
+    author_id: int | None = Query(None, ge=1),
+):
+    posts, next_cursor = await fetch_post_page(db, query, author_id)
+    return post_page_response(request, response, query, posts, next_cursor)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_posts(
+    request: Request,
+    q: str | None = Query(None),
+    author_id: int | None = Query(None, ge=1),
+    view: Literal["full", "summary"] = Query("full"),
+    format: post_export.ExportFormat = Query("ndjson"),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    # Streams every matching post (newest first) from a server-side cursor;
+    # gzip-encoded on the fly when the client accepts it.
+    summary = view == "summary"
+    stmt = post_service.export_posts_stmt(q, summary, author_id)
+    chunks = post_export.export_chunks(
+        read_sessionmaker(request), stmt, summary, format
+    )
+    headers = {
+        "Content-Disposition": f'attachment; filename="posts.{format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if accepts_encoding(request, "gzip"):
+        chunks = post_export.gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        chunks, media_type=post_export.MEDIA_TYPES[format], headers=headers
+    )
+
+
+def _post_validators(post) -> dict:
+    return conditional.validator_headers(
+        conditional.post_etag(post.id, post.updated_at), post.updated_at
+    )
 
 
 @router.get("/{post_id}", response_model=PostOut)
 async def get_post(
     post_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    redis: Redis = Depends(get_redis),
 ):
-    post = await post_service.get_post(db, post_id)
-    if not post:
+    if not settings.POST_CACHE_ENABLED:
+        if conditional.has_conditions(request):
+            # Revalidation reads only updated_at; the row is loaded on a miss.
+            updated_at = await post_service.get_post_version(db, post_id)
+            if updated_at is None:
+                raise HTTPException(status.HTTP_404_NOT_FOUND, "Post not found")
+            etag = conditional.post_etag(post_id, updated_at)
+            if conditional.is_not_modified(request, etag, updated_at):
+                return conditional.not_modified(
+                    conditional.validator_headers(etag, updated_at)
+                )
+        post = await post_service.get_post(db, post_id)
+        if not post:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Post not found")
+        headers = _post_validators(post)
+        if settings.FAST_JSON_RESPONSES:
+            return dump_response(post_adapter, post, headers=headers)
+        response.headers.update(headers)
+        return post
+
+    async def load() -> post_cache.CachedPost | None:
+        # Fill from the primary: the cache is shared and read before any
+        # read-your-writes routing, so a lagging replica's row must not land
+        # in it after a write has invalidated the entry.
+        async with async_session() as primary:
+            post = await post_service.get_post(primary, post_id)
+        if post is None:
+            return None
+        body = PostOut.model_validate(post).model_dump_json()
+        return post_cache.CachedPost(post.updated_at, body)
+
+    cached = await post_cache.get_or_load(redis, post_id, load)
+    if cached is None:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Post not found")
-    return post
+    body = cached.body
+    # The validator is stored next to the body; no need to parse it.
+    headers = conditional.validator_headers(
+        conditional.post_etag(post_id, cached.updated_at), cached.updated_at
+    )
+    if conditional.is_not_modified(request, headers["ETag"], cached.updated_at):
+        return conditional.not_modified(headers)
+    encoding = compression.negotiate(request.headers.get("accept-encoding"))
+    if (
+        settings.COMPRESSION_ENABLED
+        and encoding
+        and len(body) >= settings.COMPRESSION_MIN_SIZE
+    ):
+        # Hot posts reuse their compressed body instead of going through
+        # CompressionMiddleware on every hit.
+        content = post_cache.compressed_variant(headers["ETag"], encoding, body)
+        headers.update({"Content-Encoding": encoding, "Vary": "Accept-Encoding"})
+        return Response(content=content, media_type="application/json", headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.patch("/{post_id}", response_model=PostOut)
 async def update_post(
     post_id: uuid.UUID,
     data: PostUpdate,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    redis: Redis = Depends(get_redis),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
+    if_versions = conditional.if_match_versions(request, post_id)
     try:
-        post = await post_service.update_post(db, post_id, current_user.id, data)
+        post = await post_service.update_post(
+            db, post_id, current_user.id, data, if_versions
+        )
         if not post:
             raise HTTPException(status.HTTP_404_NOT_FOUND, "Post not found")
+        await post_cache.invalidate(redis, post_id)
+        headers = _post_validators(post)
+        if settings.FAST_JSON_RESPONSES:
+            return dump_response(post_adapter, post, headers=headers)
+        response.headers.update(headers)
         return post
     except PermissionError:
         raise HTTPException(status.HTTP_403_FORBIDDEN, "Not the owner")
+    except post_service.StalePostError:
+        raise HTTPException(
+            status.HTTP_412_PRECONDITION_FAILED, "Post was modified"
+        )
 
 
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_post(
     post_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    redis: Redis = Depends(get_redis),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     try:
         deleted = await post_service.delete_post(db, post_id, current_user.id)
         if not deleted:
             raise HTTPException(status.HTTP_404_NOT_FOUND, "Post not found")
+        await post_cache.invalidate(redis, post_id)
     except PermissionError:
         raise HTTPException(status.HTTP_403_FORBIDDEN, "Not the owner")
-    return None
\ No newline at end of file
+    return None
+
+
+@actions_router.post("/posts:batch", response_model=PostBatchResult)
+async def create_posts_batch(
+    data: PostBatchCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    results = []
+    valid: list[PostCreate] = []
+    for index, item in enumerate(data.items):
+        try:
+            valid.append(PostCreate.model_validate(item))
+            results.append({"index": index})
+        except ValidationError as e:
+            errors = e.errors(include_url=False, include_context=False)
+            results.append({"index": index, "errors": errors})
+    posts = iter(await post_service.create_posts(db, current_user.id, valid))
+    for result in results:
+        if "errors" not in result:
+            result["post"] = next(posts)
+    body = {"created": len(valid), "items": results}
+    if settings.FAST_JSON_RESPONSES:
+        return dump_response(batch_result_adapter, body)
+    return PostBatchResult.model_validate(body, from_attributes=True)
+
+
+@actions_router.post("/posts:mget", response_model=PostMultiGet)
+async def get_posts_batch(
+    data: PostIds, db: AsyncSession = Depends(get_read_db)
+):
+    ids = list(dict.fromkeys(data.ids))
+    found = {post.id: post for post in await post_service.get_posts(db, ids)}
+    body = {
+        "items": [found[i] for i in ids if i in found],
+        "missing": [i for i in ids if i not in found],
+    }
+    if settings.FAST_JSON_RESPONSES:
+        return dump_response(multi_get_adapter, body)
+    return PostMultiGet.model_validate(body, from_attributes=True)
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.posts import (
+    PostListQuery,
+    PostListResponse,
+    fetch_post_page,
+    post_list_query,
+    post_page_response,
+)
+from app.core.deps import get_read_db
+from app.repositories.users import users_repo
+
+router = APIRouter()
+
+
+@router.get("/{user_id}/posts", response_model=PostListResponse)
+async def list_user_posts(
+    user_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    query: PostListQuery = Depends(post_list_query),
+):
+    posts, next_cursor = await fetch_post_page(db, query, author_id=user_id)
+    # Only an empty page costs the extra lookup that tells 404 from no posts.
+    if not posts and await users_repo.get_by_id(db, user_id) is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "User not found")
+    return post_page_response(request, response, query, posts, next_cursor)
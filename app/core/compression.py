@@ -0,0 +1,222 @@
+import logging
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger("app.compression")
+
+# brotli and zstandard ship in requirements.txt; if one is missing anyway its
+# encoding is never negotiated and a warning is logged at import.
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/problem+json",
+    "text/",
+)
+
+compressed_responses = registry.counter(
+    "http_compressed_responses_total",
+    "Responses compressed by CompressionMiddleware",
+    ("encoding",),
+)
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    # "gzip, br;q=0.5, *;q=0" -> {"gzip": 1.0, "br": 0.5, "*": 0.0}
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name] = q
+    return accepted
+
+
+def _available(encoding: str) -> bool:
+    if encoding == "br":
+        return brotli is not None
+    if encoding == "zstd":
+        return zstandard is not None
+    return encoding == "gzip"
+
+
+_missing = [e for e in settings.COMPRESSION_ENCODINGS if not _available(e)]
+if settings.COMPRESSION_ENABLED and _missing:
+    logger.warning("compression encodings %s unavailable: library not installed", _missing)
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """Best encoding the client accepts; ties go to COMPRESSION_ENCODINGS order."""
+    if not accept_encoding:
+        return None
+    accepted = parse_accept_encoding(accept_encoding)
+    best, best_q = None, 0.0
+    for encoding in settings.COMPRESSION_ENCODINGS:
+        if not _available(encoding):
+            continue
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Brotli:
+    def __init__(self):
+        self._c = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def sync(self) -> bytes:
+        return self._c.flush()
+
+    def flush(self) -> bytes:
+        return self._c.finish()
+
+
+class _Zstd:
+    def __init__(self):
+        level = settings.COMPRESSION_ZSTD_LEVEL
+        self._c = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def sync(self) -> bytes:
+        return self._c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def flush(self) -> bytes:
+        return self._c.flush()
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._c = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def sync(self) -> bytes:
+        return self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def flush(self) -> bytes:
+        return self._c.flush()
+
+
+def compressor(encoding: str):
+    """Streaming compressor: ``compress(data)``, ``sync()`` to emit everything
+    buffered so far as a decodable prefix, and a final ``flush()``."""
+    if encoding == "br":
+        return _Brotli()
+    if encoding == "zstd":
+        return _Zstd()
+    return _Gzip(settings.COMPRESSION_GZIP_LEVEL)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    c = compressor(encoding)
+    return c.compress(data) + c.flush()
+
+
+def _compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "")
+    return "content-encoding" not in headers and content_type.startswith(
+        COMPRESSIBLE_TYPES
+    )
+
+
+class CompressionMiddleware:
+    """Compresses JSON/NDJSON/text responses per Accept-Encoding.
+
+    Bodies under COMPRESSION_MIN_SIZE, excluded paths (auth responses carry
+    tokens) and responses that are already encoded are sent as they are.
+    Streaming bodies are compressed and flushed chunk by chunk.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(
+            tuple(settings.COMPRESSION_EXCLUDE_PATHS)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        start_message = None
+        stream = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, stream, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            if stream is None:
+                headers = MutableHeaders(raw=list(start_message["headers"]))
+                body = message.get("body", b"")
+                more_body = message.get("more_body", False)
+                if not _compressible(headers):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                headers.add_vary_header("Accept-Encoding")
+                if encoding is None or (
+                    not more_body and len(body) < settings.COMPRESSION_MIN_SIZE
+                ):
+                    passthrough = True
+                    await send({**start_message, "headers": headers.raw})
+                    await send(message)
+                    return
+
+                compressed_responses.inc(encoding=encoding)
+                headers["Content-Encoding"] = encoding
+                if not more_body:
+                    data = compress(body, encoding)
+                    headers["Content-Length"] = str(len(data))
+                    await send({**start_message, "headers": headers.raw})
+                    await send({"type": "http.response.body", "body": data})
+                    passthrough = True
+                    return
+                del headers["Content-Length"]
+                stream = compressor(encoding)
+                await send({**start_message, "headers": headers.raw})
+
+            # Sync per chunk so a streamed body (e.g. an NDJSON export) reaches
+            # the client as it is produced instead of sitting in the compressor.
+            body = stream.compress(message.get("body", b""))
+            more_body = message.get("more_body", False)
+            body += stream.sync() if more_body else stream.flush()
+            if body or not more_body:
+                await send(
+                    {"type": "http.response.body", "body": body, "more_body": more_body}
+                )
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,175 @@
+import asyncio
+import time
+from collections import deque
+
+from app.core.config import settings
+from app.core.errors import standard_error
+from app.core.metrics import registry
+from app.db.replicas import READ_ONLY_POSTS
+
+# Multiplicative decrease applied when a window's p90 latency misses target.
+BACKOFF = 0.9
+# Latency samples kept per window; enough for a stable p90.
+WINDOW_SAMPLES = 1000
+
+concurrency_limit = registry.gauge(
+    "concurrency_limit",
+    "Current adaptive concurrency limit by route group",
+    ("group",),
+)
+concurrency_inflight = registry.gauge(
+    "concurrency_inflight",
+    "Requests holding a concurrency slot by route group",
+    ("group",),
+)
+concurrency_queued = registry.gauge(
+    "concurrency_queued",
+    "Requests waiting for a concurrency slot by route group",
+    ("group",),
+)
+concurrency_rejected = registry.counter(
+    "concurrency_rejected_total",
+    "Requests shed with 503 by route group and reason",
+    ("group", "reason"),
+)
+
+
+def route_group(method: str, path: str) -> str | None:
+    if path.startswith("/api/v1/auth"):
+        return "auth"
+    if path == "/api/v1/posts/export":
+        return "posts_export"
+    if path.startswith(("/api/v1/posts", "/api/v1/users")):
+        if method in ("GET", "HEAD") or path in READ_ONLY_POSTS:
+            return "posts_read"
+        return "posts_write"
+    return None
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for one route group.
+
+    Latency is measured from slot acquisition to the end of the response. Once
+    per window, a p90 over the group's target shrinks the limit by BACKOFF;
+    otherwise, if at least half the limit was in use, it grows by one. Past the
+    limit, requests queue (FIFO, bounded) for up to CONCURRENCY_QUEUE_TIMEOUT_SEC.
+    """
+
+    def __init__(self, name: str, limit: int, target_sec: float):
+        self.name = name
+        self.limit = float(limit)
+        self.target_sec = target_sec
+        self.inflight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._samples: list[float] = []
+        self._peak_inflight = 0
+        self._window_end = time.monotonic() + settings.CONCURRENCY_WINDOW_SEC
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _has_slot(self) -> bool:
+        return self.inflight < int(self.limit)
+
+    def _take(self) -> None:
+        self.inflight += 1
+        self._peak_inflight = max(self._peak_inflight, self.inflight)
+
+    async def acquire(self) -> str | None:
+        """Takes a slot; returns None, or the reason the request is shed."""
+        if self._has_slot() and not self._waiters:
+            self._take()
+            return None
+        if len(self._waiters) >= settings.CONCURRENCY_QUEUE_SIZE:
+            return "queue_full"
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, settings.CONCURRENCY_QUEUE_TIMEOUT_SEC)
+            return None
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # Handed a slot just as we gave up: pass it on.
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(e, TimeoutError):
+                return "timeout"
+            raise
+
+    def release(self) -> None:
+        self.inflight -= 1
+        while self._waiters and self._has_slot():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._take()
+                waiter.set_result(None)
+
+    def record(self, latency: float) -> None:
+        if len(self._samples) < WINDOW_SAMPLES:
+            self._samples.append(latency)
+        now = time.monotonic()
+        if now < self._window_end:
+            return
+        samples = sorted(self._samples)
+        p90 = samples[int(0.9 * (len(samples) - 1))]
+        if p90 > self.target_sec:
+            self.limit = max(settings.CONCURRENCY_MIN_LIMIT, self.limit * BACKOFF)
+        elif self._peak_inflight >= self.limit / 2:
+            self.limit = min(settings.CONCURRENCY_MAX_LIMIT, self.limit + 1)
+        self._samples = []
+        self._peak_inflight = self.inflight
+        self._window_end = now + settings.CONCURRENCY_WINDOW_SEC
+
+
+limiters = {
+    group: AdaptiveLimiter(
+        group, limit, settings.CONCURRENCY_TARGET_MS.get(group, 1000) / 1000
+    )
+    for group, limit in settings.CONCURRENCY_LIMITS.items()
+}
+
+
+class ConcurrencyLimitMiddleware:
+    """Caps in-flight requests per route group (see route_group).
+
+    Keeps one overloaded group, typically bcrypt-bound auth, from dragging
+    down latency for the others on the same worker. Shed requests get a
+    503 with Retry-After.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+        limiter = limiters.get(route_group(scope["method"], scope["path"]))
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        reason = await limiter.acquire()
+        if reason is not None:
+            concurrency_rejected.inc(group=limiter.name, reason=reason)
+            response = standard_error(
+                503,
+                "Server busy, try again later",
+                headers={"Retry-After": str(settings.CONCURRENCY_RETRY_AFTER)},
+            )
+            await response(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.record(time.perf_counter() - start)
+            limiter.release()
+
+
+concurrency_limit.set_function(lambda: {(g,): int(l.limit) for g, l in limiters.items()})
+concurrency_inflight.set_function(lambda: {(g,): l.inflight for g, l in limiters.items()})
+concurrency_queued.set_function(lambda: {(g,): l.queued for g, l in limiters.items()})
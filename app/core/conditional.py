@@ -0,0 +1,106 @@
+import hashlib
+import uuid
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable
+
+from fastapi import Request, Response, status
+
+# Post validators are weak ETags built from (id, updated_at):
+#   W/"<id hex>.<updated_at in microseconds, hex>"
+# so an If-Match value can be turned back into the version it names.
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_USEC = timedelta(microseconds=1)
+
+
+def post_etag(post_id: uuid.UUID | str, updated_at: datetime) -> str:
+    usec = (updated_at - _EPOCH) // _USEC
+    return f'W/"{uuid.UUID(str(post_id)).hex}.{usec:x}"'
+
+
+def parse_post_etag(tag: str) -> tuple[uuid.UUID, datetime] | None:
+    tag = tag.strip().removeprefix("W/").strip('"')
+    post_id, _, usec = tag.partition(".")
+    try:
+        return uuid.UUID(post_id), _EPOCH + int(usec, 16) * _USEC
+    except (ValueError, OverflowError):
+        return None
+
+
+def list_etag(items: Iterable, extra: str | None = None) -> str:
+    digest = hashlib.sha1()
+    for item in items:
+        digest.update(post_etag(item.id, item.updated_at).encode())
+    digest.update((extra or "").encode())
+    return f'W/"{digest.hexdigest()[:32]}"'
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: datetime | None) -> dict:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def _etag_list(value: str) -> list[str]:
+    return [tag.strip() for tag in value.split(",") if tag.strip()]
+
+
+def _weak_equal(a: str, b: str) -> bool:
+    return a.removeprefix("W/") == b.removeprefix("W/")
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime | None
+) -> bool:
+    # If-None-Match wins over If-Modified-Since (RFC 9110 13.2.2).
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = _etag_list(if_none_match)
+        return "*" in tags or any(_weak_equal(tag, etag) for tag in tags)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            # asctime and "-0000" dates parse naive; HTTP dates are UTC.
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def has_conditions(request: Request) -> bool:
+    headers = request.headers
+    return "if-none-match" in headers or "if-modified-since" in headers
+
+
+def not_modified(headers: dict) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def if_match_versions(request: Request, post_id: uuid.UUID) -> list[datetime] | None:
+    """``updated_at`` values named by If-Match for ``post_id``.
+
+    None when there is no If-Match (or it is ``*``); an empty list when no tag
+    names this post, which can never match. Tags are compared weakly: they
+    identify versions of the row, not byte-exact representations.
+    """
+    if_match = request.headers.get("if-match")
+    if if_match is None:
+        return None
+    tags = _etag_list(if_match)
+    if "*" in tags:
+        return None
+    versions = []
+    for tag in tags:
+        parsed = parse_post_etag(tag)
+        if parsed and parsed[0] == post_id:
+            versions.append(parsed[1])
+    return versions
@@ -1,3 +1,6 @@
+from typing import Literal
+
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -5,7 +8,31 @@ class Settings(BaseSettings):
     CORS_ALLOW_ALL: bool = True
     CORS_ORIGINS: str = ""
     DATABASE_URL: str
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    DB_SLOW_QUERY_MS: float = 200.0
+    # Optional read replicas for read-only post endpoints (JSON list of URLs).
+    DATABASE_READ_URLS: list[str] = []
+    DB_READ_SELECTION: Literal["round_robin", "least_connections"] = "round_robin"
+    # After a write, the same client reads from the primary for this long.
+    DB_READ_YOUR_WRITES_SEC: float = 5.0
+    DB_REPLICA_MAX_LAG_SEC: float = 10.0
+    DB_REPLICA_HEALTH_INTERVAL_SEC: float = 5.0
+    # Schema changes run once per deploy via `python -m app.db.migrations`;
+    # workers only check the version. On, the lifespan applies pending
+    # migrations itself (local dev, single process).
+    DB_MIGRATE_ON_STARTUP: bool = False
     REDIS_URL: str
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 5.0
+    REDIS_SOCKET_TIMEOUT: float = 2.0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 2.0
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
 
     JWT_SECRET: str = "change-me"
     JWT_ALG: str = "HS256"
@@ -15,6 +42,103 @@ class Settings(BaseSettings):
     COOKIE_SECURE: bool = False
     COOKIE_DOMAIN: str | None = None
 
+    # db: load the user row on every request; claims: trust profile claims in
+    # the access token; cached: in-process TTL/LRU cache, optionally in Redis.
+    AUTH_USER_MODE: Literal["db", "claims", "cached"] = "db"
+    USER_CACHE_TTL_SEC: int = 60
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_REDIS: bool = False
+
+    # ilike: legacy title-only substring match (sequential scan);
+    # fts: tsvector + GIN over title and content, ranked with ts_rank_cd;
+    # trgm: pg_trgm GIN indexes on title and content, ranked by similarity.
+    POSTS_SEARCH_BACKEND: Literal["ilike", "fts", "trgm"] = "fts"
+
+    # Characters of content returned as the excerpt by list_posts?view=summary.
+    POST_EXCERPT_CHARS: int = 200
+
+    # Max items per POST /posts:batch and ids per POST /posts:mget.
+    POST_BATCH_MAX_ITEMS: int = 100
+
+    # Rows fetched per server-side cursor round trip by GET /posts/export.
+    POST_EXPORT_FETCH_SIZE: int = 1000
+
+    # Purge job (python -m app.services.post_purge): soft-deleted posts older
+    # than the retention period are archived to posts_archive or deleted, in
+    # small keyset batches with a pause after each.
+    POST_PURGE_MODE: Literal["archive", "delete"] = "archive"
+    POST_PURGE_RETENTION_DAYS: int = 30
+    POST_PURGE_BATCH_SIZE: int = 500
+    POST_PURGE_PAUSE_SEC: float = 0.5
+
+    POST_CACHE_ENABLED: bool = True
+    POST_CACHE_TTL_SEC: int = 60
+    POST_CACHE_NEGATIVE_TTL_SEC: int = 10
+    # Per-process LRU of precompressed cached post bodies.
+    POST_CACHE_VARIANTS_MAX: int = 1000
+
+    # Response compression, negotiated by Accept-Encoding in preference order;
+    # br and zstd use the brotli / zstandard packages. Levels are
+    # capped at fast settings to bound CPU per response.
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_ENCODINGS: list[Literal["zstd", "br", "gzip"]] = ["zstd", "br", "gzip"]
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = Field(5, ge=1, le=6)
+    COMPRESSION_BROTLI_QUALITY: int = Field(4, ge=0, le=5)
+    COMPRESSION_ZSTD_LEVEL: int = Field(3, ge=1, le=6)
+    # Auth responses carry tokens next to request data; never compress them.
+    COMPRESSION_EXCLUDE_PATHS: list[str] = ["/api/v1/auth"]
+
+    # Post endpoints validate ORM rows once and return pre-encoded JSON bytes;
+    # everything else is rendered with orjson instead of stdlib json.
+    FAST_JSON_RESPONSES: bool = False
+
+    # policy name -> "<requests>/<window seconds>", e.g. {"login": "5/300"}.
+    # An override is merged over these defaults, so it may name only the
+    # policies it changes.
+    RATE_LIMITS: dict[str, str] = {"login": "5/300"}
+    RATE_LIMIT_LOCAL_PREFILTER: bool = True
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 100_000
+
+    # Adaptive (AIMD) in-flight limits per route group: auth, posts_read,
+    # posts_write, posts_export. Each limit starts at CONCURRENCY_LIMITS and
+    # is adjusted every CONCURRENCY_WINDOW_SEC against the group's p90 latency
+    # target. Requests over the limit wait in a bounded queue, then get 503 +
+    # Retry-After. Groups missing from CONCURRENCY_LIMITS are not limited.
+    CONCURRENCY_LIMIT_ENABLED: bool = True
+    CONCURRENCY_LIMITS: dict[str, int] = {
+        "auth": 16,
+        "posts_read": 64,
+        "posts_write": 32,
+        "posts_export": 4,
+    }
+    CONCURRENCY_TARGET_MS: dict[str, float] = {
+        "auth": 1000,
+        "posts_read": 250,
+        "posts_write": 500,
+        "posts_export": 60000,
+    }
+    CONCURRENCY_MIN_LIMIT: int = 2
+    CONCURRENCY_MAX_LIMIT: int = 512
+    CONCURRENCY_WINDOW_SEC: float = 1.0
+    CONCURRENCY_QUEUE_SIZE: int = 64
+    CONCURRENCY_QUEUE_TIMEOUT_SEC: float = 2.0
+    CONCURRENCY_RETRY_AFTER: int = 1
+
+    # Adds X-DB-Queries / X-Redis-Calls (and timings) to every response.
+    DEBUG_REQUEST_STATS: bool = False
+
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
+    PASSWORD_HASH_RETRY_AFTER: int = 1
+
+    # Before serving, each worker opens pool connections and runs the JWT,
+    # bcrypt and response serialization paths once.
+    WARMUP_ENABLED: bool = True
+    WARMUP_DB_CONNECTIONS: int = 2
+    WARMUP_REDIS_CONNECTIONS: int = 2
+
 
 
     model_config = SettingsConfigDict(
@@ -23,6 +147,11 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
+    @field_validator("RATE_LIMITS")
+    @classmethod
+    def _merge_rate_limits(cls, value: dict[str, str]) -> dict[str, str]:
+        return {**cls.model_fields["RATE_LIMITS"].default, **value}
+
     def cors_origins_list(self) -> list[str]:
         s = (self.CORS_ORIGins or "").strip()
         if not s:
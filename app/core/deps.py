@@ -1,17 +1,29 @@
+from datetime import datetime
 from typing import AsyncGenerator
 
-import redis.asyncio as redis
-from fastapi import Depends, HTTPException, status
+from redis.asyncio import Redis
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import decode_token
+from app.core.redis_pool import get_client
+from app.core.revocation import revoked_tokens
+from app.core.security import PROFILE_CLAIMS, decode_token
+from app.core.user_cache import user_cache
+from app.db.replicas import read_sessionmaker
 from app.db.session import async_session
 from app.models.user import User
 from app.repositories.users import users_repo
+from app.schemas.auth import UserOut
+
+# ORM row in "db" mode, detached snapshot in "claims" and "cached" modes.
+CurrentUser = User | UserOut
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl="/api/v1/auth/login", auto_error=False
+)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -19,13 +31,30 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-async def get_redis():
-    return redis.from_url(settings.REDIS_URL, decode_responses=True)
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    # Read-only endpoints: a healthy replica when configured, else the primary.
+    async with read_sessionmaker(request)() as session:
+        yield session
+
+
+async def get_redis() -> Redis:
+    return get_client()
+
+
+def _user_from_claims(user_id: int, payload: dict) -> UserOut | None:
+    if any(claim not in payload for claim in PROFILE_CLAIMS):
+        return None
+    return UserOut.model_construct(
+        id=user_id,
+        email=payload["email"],
+        fullname=payload["name"],
+        created_at=datetime.fromisoformat(payload["uca"]),
+    )
 
 
 async def get_current_user(
     db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+) -> CurrentUser:
     try:
         payload = decode_token(token)
         if payload.get("type") != "access":
@@ -34,6 +63,12 @@ async def get_current_user(
                 detail="Invalid token type",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        if revoked_tokens.is_revoked(payload.get("jti")):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
         user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(
@@ -41,6 +76,7 @@ async def get_current_user(
                 detail="Invalid token, no sub",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        user_id = int(user_id)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -50,11 +86,25 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         ) from e
 
-    user = await users_repo.get_by_id(db, user_id=int(user_id))
+    mode = settings.AUTH_USER_MODE
+    if mode == "claims":
+        principal = _user_from_claims(user_id, payload)
+        if principal is not None:
+            return principal
+
+    r = get_client() if mode == "cached" and settings.USER_CACHE_REDIS else None
+    if mode == "cached":
+        cached = await user_cache.get(user_id, r)
+        if cached is not None:
+            return cached
+
+    user = await users_repo.get_by_id(db, user_id=user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if mode == "cached":
+        await user_cache.set(UserOut.model_validate(user), r)
     return user
\ No newline at end of file
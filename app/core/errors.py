@@ -5,16 +5,19 @@ from sqlalchemy.exc import IntegrityError
 
 
 def standard_error(
-    code: int, message: str, details: dict | None = None
+    code: int,
+    message: str,
+    details: dict | None = None,
+    headers: dict | None = None,
 ) -> JSONResponse:
     content = {"error": {"code": code, "message": message}}
     if details:
         content["error"]["details"] = details
-    return JSONResponse(status_code=code, content=content)
+    return JSONResponse(status_code=code, content=content, headers=headers)
 
 
 async def http_exception_handler(_: Request, exc: HTTPException):
-    return standard_error(exc.status_code, exc.detail)
+    return standard_error(exc.status_code, exc.detail, headers=exc.headers)
 
 
 async def validation_error_handler(_: Request, exc: RequestValidationError):
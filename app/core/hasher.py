@@ -0,0 +1,96 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.security import pwd_context
+
+hash_queue_depth = registry.gauge(
+    "password_hash_queue_depth",
+    "Password hash/verify jobs submitted and not yet finished",
+)
+hash_latency = registry.histogram(
+    "password_hash_seconds",
+    "Password hash/verify latency including queue wait",
+    ("op",),
+)
+hash_rejected = registry.counter(
+    "password_hash_rejected_total",
+    "Password hash/verify jobs rejected because the queue was full",
+)
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(password: str, password_hash: str) -> bool:
+    return pwd_context.verify(password, password_hash)
+
+
+class PasswordHasher:
+    def __init__(self, mode: str, workers: int, queue_size: int, retry_after: int):
+        self.mode = mode
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.retry_after = retry_after
+        self._executor: Executor | None = None
+        self._pending = 0
+
+    def start(self) -> None:
+        if self._executor is not None:
+            return
+        if self.mode == "process":
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="pwhash"
+            )
+
+    async def shutdown(self) -> None:
+        # Queued jobs are dropped; waiting for running ones happens off the
+        # event loop so the rest of the lifespan teardown is not blocked.
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def _run(self, op: str, fn, *args):
+        if self._pending >= self.capacity:
+            hash_rejected.inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, try again later",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        self.start()
+        self._pending += 1
+        hash_queue_depth.set(self._pending)
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+            hash_queue_depth.set(self._pending)
+            hash_latency.observe(time.perf_counter() - start, op=op)
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", _hash, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run("verify", _verify, password, password_hash)
+
+
+password_hasher = PasswordHasher(
+    mode=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER,
+)
@@ -0,0 +1,153 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.startup import startup_timer
+
+http_requests = registry.counter(
+    "http_requests_total",
+    "HTTP requests by route, method and status",
+    ("method", "route", "status"),
+)
+http_latency = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route"),
+)
+db_query_latency = registry.histogram(
+    "db_query_duration_seconds",
+    "Database statement latency",
+)
+db_queries_per_request = registry.histogram(
+    "db_queries_per_request",
+    "Database statements executed per HTTP request",
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50),
+)
+redis_command_latency = registry.histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency by command",
+    ("command",),
+)
+redis_calls_per_request = registry.histogram(
+    "redis_calls_per_request",
+    "Redis round trips per HTTP request",
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50),
+)
+
+
+@dataclass
+class RequestStats:
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    redis_calls: int = 0
+    redis_seconds: float = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def record_db(elapsed: float) -> None:
+    db_query_latency.observe(elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_seconds += elapsed
+
+
+def record_redis(command: str, elapsed: float) -> None:
+    redis_command_latency.observe(elapsed, command=command)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.redis_calls += 1
+        stats.redis_seconds += elapsed
+
+
+class InstrumentedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True):
+        command = "MULTI" if self.is_transaction else "PIPELINE"
+        start = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            record_redis(command, time.perf_counter() - start)
+
+
+class InstrumentedRedis(Redis):
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            record_redis(str(args[0]).upper(), time.perf_counter() - start)
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None):
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+def _route_label(scope) -> str:
+    # Template of the matched route, e.g. /api/v1/posts/{post_id}. With lazily
+    # included routers path_format lacks the router prefix, so the prefix is
+    # taken from the raw path: the segments in front of the template's own.
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    if template is None:
+        return "unmatched"
+    prefix = scope["path"].split("/")[: -template.count("/")]
+    return "/".join(prefix) + template
+
+
+class MetricsMiddleware:
+    """Per-route latency and status counts; per-request DB/Redis call counts.
+
+    With DEBUG_REQUEST_STATS on, the counts are also returned in the
+    X-DB-Queries / X-Redis-Calls response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.DEBUG_REQUEST_STATS:
+                    headers = list(message.get("headers", []))
+                    headers += [
+                        (b"x-db-queries", str(stats.db_queries).encode()),
+                        (b"x-db-time-ms", f"{stats.db_seconds * 1000:.1f}".encode()),
+                        (b"x-redis-calls", str(stats.redis_calls).encode()),
+                        (b"x-redis-time-ms", f"{stats.redis_seconds * 1000:.1f}".encode()),
+                    ]
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            route = _route_label(scope)
+            method = scope["method"]
+            http_latency.observe(time.perf_counter() - start, method=method, route=route)
+            http_requests.inc(method=method, route=route, status=status_code)
+            db_queries_per_request.observe(stats.db_queries)
+            redis_calls_per_request.observe(stats.redis_calls)
+            startup_timer.request_done()
@@ -0,0 +1,20 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(created_at: datetime, post_id: uuid.UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(post_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, post_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), uuid.UUID(post_id)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid cursor") from e
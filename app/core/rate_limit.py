@@ -0,0 +1,177 @@
+import math
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from fastapi import Depends, HTTPException, Request, status
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.deps import get_redis
+from app.core.metrics import registry
+
+decisions = registry.counter(
+    "rate_limit_decisions_total",
+    "Rate limiter decisions by policy and result",
+    ("policy", "result"),
+)
+decision_latency = registry.histogram(
+    "rate_limit_decision_seconds",
+    "Time to reach a rate limit decision",
+    ("policy",),
+)
+
+# GCRA: each request pushes the key's theoretical arrival time (TAT) forward
+# by one emission interval (window / limit); a request is rejected while the
+# TAT would sit more than one window ahead of now. Uses the Redis clock so all
+# workers agree.
+# KEYS: bucket key; ARGV: emission interval ms, window ms
+# Returns {allowed, retry_after_ms}
+GCRA_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - window
+if allow_at > now then
+    return {0, math.ceil(allow_at - now)}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return {1, 0}
+"""
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """``"5/300"`` -> (5 requests, 300 seconds)."""
+    limit, window = rate.split("/", 1)
+    return int(limit), int(window)
+
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+async def ip_key(request: Request) -> str:
+    return client_ip(request)
+
+
+async def login_key(request: Request) -> str:
+    try:
+        body = await request.json()
+    except ValueError:
+        body = None
+    email = body.get("email") if isinstance(body, dict) else None
+    # Same normalisation for every spelling, so User@x.com and user@x.com
+    # share one bucket.
+    email = email.strip().lower() if isinstance(email, str) else ""
+    return f"{email}:{client_ip(request)}"
+
+
+class LocalTokenBucket:
+    """Per-process mirror of the Redis policy.
+
+    This worker only sees a subset of a caller's requests, so an empty local
+    bucket means the shared limit is exceeded as well and Redis can be
+    skipped. The local bucket never rejects a caller the shared limit would
+    admit.
+    """
+
+    def __init__(self, limit: int, window_sec: int, max_keys: int):
+        self.capacity = limit
+        self.rate = limit / window_sec
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def take(self, key: str) -> float:
+        """Take a token; returns 0 on success or seconds until one is available."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            return (1 - tokens) / self.rate
+        self._buckets[key] = (tokens - 1, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return 0.0
+
+    def refund(self, key: str) -> None:
+        """Give back a token taken for a request the shared limit rejected."""
+        entry = self._buckets.get(key)
+        if entry is not None:
+            tokens, updated = entry
+            self._buckets[key] = (min(self.capacity, tokens + 1), updated)
+
+
+class RateLimiter:
+    """FastAPI dependency enforcing the ``settings.RATE_LIMITS[policy]`` limit.
+
+    Usage: ``@router.post(..., dependencies=[Depends(RateLimiter("login", login_key))])``
+    """
+
+    def __init__(
+        self,
+        policy: str,
+        key: Callable[[Request], Awaitable[str]] = ip_key,
+        local_prefilter: bool | None = None,
+    ):
+        self.policy = policy
+        self.key = key
+        if policy not in settings.RATE_LIMITS:
+            raise ValueError(f"RATE_LIMITS has no entry for policy {policy!r}")
+        self.limit, self.window_sec = parse_rate(settings.RATE_LIMITS[policy])
+        if local_prefilter is None:
+            local_prefilter = settings.RATE_LIMIT_LOCAL_PREFILTER
+        self.local = (
+            LocalTokenBucket(self.limit, self.window_sec, settings.RATE_LIMIT_LOCAL_MAX_KEYS)
+            if local_prefilter
+            else None
+        )
+
+    def _reject(self, retry_after_sec: float, result: str) -> HTTPException:
+        decisions.inc(policy=self.policy, result=result)
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after_sec)))},
+        )
+
+    async def hit(self, r: Redis, key: str) -> None:
+        if self.local is not None:
+            wait = self.local.take(key)
+            if wait:
+                raise self._reject(wait, "rejected_local")
+
+        script = r.register_script(GCRA_LUA)
+        interval_ms = self.window_sec * 1000 / self.limit
+        try:
+            allowed, retry_after_ms = await script(
+                keys=[f"rl:{self.policy}:{key}"],
+                args=[interval_ms, self.window_sec * 1000],
+            )
+        except RedisError:
+            # Fail open: an unavailable limiter must not lock everyone out.
+            decisions.inc(policy=self.policy, result="error")
+            return
+        if not allowed:
+            # Not admitted, so not counted locally either: keeps the local
+            # bucket at or above the shared state.
+            if self.local is not None:
+                self.local.refund(key)
+            raise self._reject(int(retry_after_ms) / 1000, "rejected")
+        decisions.inc(policy=self.policy, result="allowed")
+
+    async def __call__(self, request: Request, redis: Redis = Depends(get_redis)) -> None:
+        start = time.perf_counter()
+        try:
+            await self.hit(redis, await self.key(request))
+        finally:
+            decision_latency.observe(time.perf_counter() - start, policy=self.policy)
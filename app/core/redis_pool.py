@@ -0,0 +1,79 @@
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.instrumentation import InstrumentedRedis
+from app.core.metrics import registry
+
+pool_waits = registry.counter(
+    "redis_pool_waits_total",
+    "Connection checkouts that had to wait for a free pooled connection",
+)
+pool_connections = registry.gauge(
+    "redis_pool_connections",
+    "Redis pool connections by state",
+    ("state",),
+)
+
+
+class InstrumentedPool(redis.BlockingConnectionPool):
+    async def get_connection(self, *args, **kwargs):
+        if not self.can_get_connection():
+            pool_waits.inc()
+        return await super().get_connection(*args, **kwargs)
+
+
+_pool: InstrumentedPool | None = None
+
+
+def create_pool() -> InstrumentedPool:
+    return InstrumentedPool.from_url(
+        settings.REDIS_URL,
+        decode_responses=True,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+    )
+
+
+def init_pool() -> InstrumentedPool:
+    global _pool
+    if _pool is None:
+        _pool = create_pool()
+    return _pool
+
+
+async def close_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.aclose()
+        _pool = None
+
+
+def get_pool() -> InstrumentedPool:
+    # Lazily created so scripts and tests that skip the lifespan still work.
+    return _pool if _pool is not None else init_pool()
+
+
+def get_client() -> redis.Redis:
+    return InstrumentedRedis(connection_pool=get_pool())
+
+
+def pool_stats() -> dict:
+    if _pool is None:
+        return {"in_use": 0, "idle": 0, "max": settings.REDIS_MAX_CONNECTIONS, "waits": 0}
+    return {
+        "in_use": len(_pool._in_use_connections),
+        "idle": len(_pool._available_connections),
+        "max": _pool.max_connections,
+        "waits": int(pool_waits.value()),
+    }
+
+
+def _collect_pool_connections() -> dict:
+    stats = pool_stats()
+    return {(state,): stats[state] for state in ("in_use", "idle", "max")}
+
+
+pool_connections.set_function(_collect_pool_connections)
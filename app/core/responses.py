@@ -0,0 +1,34 @@
+from typing import Any
+
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.compression import parse_accept_encoding
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; bytes are sent as already encoded."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def dump_response(
+    adapter: TypeAdapter,
+    value: Any,
+    status_code: int = 200,
+    headers: dict | None = None,
+) -> ORJSONResponse:
+    # Validates ORM objects once and serializes them straight to JSON bytes,
+    # skipping the response_model re-validation and jsonable_encoder pass.
+    body = adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+    return ORJSONResponse(body, status_code=status_code, headers=headers)
+
+
+def accepts_encoding(request: Request, encoding: str) -> bool:
+    accepted = parse_accept_encoding(request.headers.get("accept-encoding", ""))
+    return accepted.get(encoding, accepted.get("*", 0.0)) > 0
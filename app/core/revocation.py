@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import time
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.redis_pool import get_client
+
+logger = logging.getLogger("app.revocation")
+
+# Revoked access-token jtis: ZSET member=jti, score=token exp (epoch seconds).
+# Every revocation is also published on CHANNEL so all workers pick it up.
+KEY = "revoked:access"
+CHANNEL = "revoked:access"
+
+revocations = registry.counter(
+    "access_token_revocations_total",
+    "Access tokens revoked (logout)",
+)
+revoked_local = registry.gauge(
+    "access_token_denylist_size",
+    "Revoked access-token jtis held in this process",
+)
+
+
+class RevocationList:
+    """In-process denylist of access-token jtis, kept until each token's exp.
+
+    Lookups are a dict probe, so get_current_user never waits on Redis. The
+    set is loaded from Redis at startup and kept current over pub/sub; after a
+    lost subscription it is reloaded from the ZSET.
+    """
+
+    def __init__(self):
+        self._revoked: dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+        self._next_purge = 0.0
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def add(self, jti: str, exp: float) -> None:
+        now = time.time()
+        if exp > now:
+            self._revoked[jti] = exp
+        if now >= self._next_purge:
+            self._purge(now)
+
+    def _purge(self, now: float) -> None:
+        self._revoked = {j: e for j, e in self._revoked.items() if e > now}
+        self._next_purge = now + 60
+
+    def is_revoked(self, jti: str | None) -> bool:
+        if jti is None:
+            return False
+        exp = self._revoked.get(jti)
+        if exp is None:
+            return False
+        if exp <= time.time():
+            self._revoked.pop(jti, None)
+            return False
+        return True
+
+    async def load_snapshot(self, r: Redis) -> None:
+        now = time.time()
+        entries = await r.zrangebyscore(KEY, now, "+inf", withscores=True)
+        for jti, exp in entries:
+            self.add(jti, exp)
+
+    async def revoke(self, r: Redis, jti: str, exp: float) -> None:
+        await self.revoke_many(r, {jti: exp})
+
+    async def revoke_many(self, r: Redis, tokens: dict[str, float]) -> None:
+        """Revokes jti -> exp pairs in one round trip; expired ones are skipped."""
+        now = time.time()
+        tokens = {jti: exp for jti, exp in tokens.items() if exp > now}
+        if not tokens:
+            return
+        for jti, exp in tokens.items():
+            self.add(jti, exp)
+        async with r.pipeline(transaction=True) as pipe:
+            pipe.zadd(KEY, tokens)
+            pipe.zremrangebyscore(KEY, "-inf", now)
+            # Nothing in the set outlives one access-token lifetime.
+            pipe.expire(KEY, settings.ACCESS_TTL_MIN * 60 + 60)
+            for jti, exp in tokens.items():
+                pipe.publish(CHANNEL, f"{jti} {exp}")
+            await pipe.execute()
+        revocations.inc(len(tokens))
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                r = get_client()
+                async with r.pubsub() as pubsub:
+                    await pubsub.subscribe(CHANNEL)
+                    # Subscribed first, so nothing revoked while the snapshot
+                    # loads is missed.
+                    await self.load_snapshot(r)
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        jti, _, exp = message["data"].partition(" ")
+                        self.add(jti, float(exp))
+            except (RedisError, OSError, ValueError):
+                logger.warning("revocation listener lost Redis; retrying", exc_info=True)
+                await asyncio.sleep(1)
+
+    async def start(self) -> None:
+        try:
+            await self.load_snapshot(get_client())
+        except RedisError:
+            logger.warning("could not load revoked tokens at startup", exc_info=True)
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+revoked_tokens = RevocationList()
+revoked_local.set_function(lambda: len(revoked_tokens))
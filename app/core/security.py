@@ -9,6 +9,18 @@ from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# User profile fields carried in tokens so "claims" auth mode can build the
+# current user without a database lookup.
+PROFILE_CLAIMS = ("email", "name", "uca")
+
+
+def profile_claims(user) -> dict:
+    return {
+        "email": user.email,
+        "name": user.fullname,
+        "uca": user.created_at.isoformat(),
+    }
+
 
 def enforce_password_length(password: str):
     if len(password.encode()) > 72:
@@ -18,12 +30,15 @@ def enforce_password_length(password: str):
         )
 
 
-def create_access_token(sub: str, jti: str | None = None) -> str:
+def create_access_token(
+    sub: str, jti: str | None = None, extra: dict | None = None
+) -> str:
     if jti is None:
         jti = str(uuid4())
     now = datetime.now(timezone.utc)
     exp = now + timedelta(minutes=settings.ACCESS_TTL_MIN)
     claims = {
+        **(extra or {}),
         "sub": sub,
         "type": "access",
         "jti": jti,
@@ -35,10 +50,11 @@ def create_access_token(sub: str, jti: str | None = None) -> str:
     )
 
 
-def create_refresh_token(sub: str, jti: str) -> str:
+def create_refresh_token(sub: str, jti: str, extra: dict | None = None) -> str:
     now = datetime.now(timezone.utc)
     exp = now + timedelta(days=settings.REFRESH_TTL_DAYS)
     claims = {
+        **(extra or {}),
         "sub": sub,
         "type": "refresh",
         "jti": jti,
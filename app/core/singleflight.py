@@ -0,0 +1,45 @@
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class _LeaderGone(Exception):
+    """The leading call was cancelled; its followers must load for themselves."""
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one in-flight call.
+
+    Followers share the leader's result or ordinary exception. If the leader is
+    cancelled (e.g. its client disconnected), one follower takes over the load.
+    """
+
+    def __init__(self, on_coalesced: Callable[[], None] | None = None):
+        self._calls: dict[str, asyncio.Future] = {}
+        self._on_coalesced = on_coalesced
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        while (fut := self._calls.get(key)) is not None:
+            if self._on_coalesced:
+                self._on_coalesced()
+            try:
+                return await asyncio.shield(fut)
+            except _LeaderGone:
+                continue
+
+        fut = asyncio.get_running_loop().create_future()
+        self._calls[key] = fut
+        try:
+            result = await fn()
+        except BaseException as e:
+            fut.set_exception(e if isinstance(e, Exception) else _LeaderGone())
+            # Mark retrieved so a leader with no followers does not log
+            # "Future exception was never retrieved".
+            fut.exception()
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
@@ -0,0 +1,73 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from app.core.metrics import registry
+
+logger = logging.getLogger("app.startup")
+
+startup_phase = registry.gauge(
+    "app_startup_phase_seconds",
+    "Worker startup: boot (process start to lifespan), schema, warmup, ready",
+    ("phase",),
+)
+first_request = registry.gauge(
+    "app_time_to_first_request_seconds",
+    "Seconds from process start to the first completed request",
+)
+
+_imported_at = time.perf_counter()
+
+
+def process_age() -> float:
+    """Seconds since this process started; for a forked worker, since the fork."""
+    try:
+        with open("/proc/self/stat") as f:
+            # starttime is field 22; split after "(comm)", which may contain spaces.
+            start_ticks = int(f.read().rpartition(")")[2].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return time.perf_counter() - _imported_at
+
+
+class StartupTimer:
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+        self._served = False
+
+    def _record(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = seconds
+        startup_phase.set(seconds, phase=phase)
+
+    def boot(self) -> None:
+        self._record("boot", process_age())
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, time.perf_counter() - start)
+
+    def ready(self) -> None:
+        self._record("ready", process_age())
+        logger.info(
+            "worker %d ready: %s",
+            os.getpid(),
+            " ".join(f"{k}={v:.3f}s" for k, v in self.phases.items()),
+        )
+
+    def request_done(self) -> None:
+        if self._served:
+            return
+        self._served = True
+        age = process_age()
+        first_request.set(age)
+        logger.info("worker %d served its first request %.3fs after start", os.getpid(), age)
+
+
+startup_timer = StartupTimer()
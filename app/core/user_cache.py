@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.redis_pool import get_client
+from app.models.user import User
+from app.schemas.auth import UserOut
+
+logger = logging.getLogger("app.user_cache")
+
+user_cache_requests = registry.counter(
+    "user_cache_requests_total",
+    "Authenticated user lookups by cache tier and result",
+    ("tier", "result"),
+)
+
+
+def _redis_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+class UserCache:
+    def __init__(self, ttl_sec: int, max_size: int):
+        self.ttl_sec = ttl_sec
+        self.max_size = max_size
+        self._entries: OrderedDict[int, tuple[float, UserOut]] = OrderedDict()
+
+    def get_local(self, user_id: int) -> UserOut | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(user_id, None)
+            return None
+        self._entries.move_to_end(user_id)
+        return user
+
+    def set_local(self, user: UserOut) -> None:
+        self._entries[user.id] = (time.monotonic() + self.ttl_sec, user)
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate_local(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get(self, user_id: int, r: Redis | None = None) -> UserOut | None:
+        user = self.get_local(user_id)
+        if user is not None:
+            user_cache_requests.inc(tier="local", result="hit")
+            return user
+        user_cache_requests.inc(tier="local", result="miss")
+        if r is None:
+            return None
+        try:
+            raw = await r.get(_redis_key(user_id))
+        except RedisError:
+            return None
+        if raw is None:
+            user_cache_requests.inc(tier="redis", result="miss")
+            return None
+        user_cache_requests.inc(tier="redis", result="hit")
+        user = UserOut.model_validate_json(raw)
+        self.set_local(user)
+        return user
+
+    async def set(self, user: UserOut, r: Redis | None = None) -> None:
+        self.set_local(user)
+        if r is None:
+            return
+        try:
+            await r.setex(_redis_key(user.id), self.ttl_sec, user.model_dump_json())
+        except RedisError:
+            pass
+
+    async def invalidate(self, user_id: int, r: Redis | None = None) -> None:
+        self.invalidate_local(user_id)
+        if r is None:
+            return
+        try:
+            await r.delete(_redis_key(user_id))
+        except RedisError:
+            # Also runs as a fire-and-forget task; the entry lives until its TTL.
+            logger.warning(
+                "could not drop user %s from the Redis cache", user_id, exc_info=True
+            )
+
+
+user_cache = UserCache(
+    ttl_sec=settings.USER_CACHE_TTL_SEC,
+    max_size=settings.USER_CACHE_MAX_SIZE,
+)
+
+
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _drop_from_redis(user_id: int) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(user_cache.invalidate(user_id, get_client()))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+# Unit-of-work flushes only: bulk update(User) / delete(User) statements do
+# not fire these events, so code issuing them must call user_cache.invalidate.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(_mapper, _connection, target: User) -> None:
+    user_cache.invalidate_local(target.id)
+    if settings.USER_CACHE_REDIS:
+        _drop_from_redis(target.id)
@@ -0,0 +1,56 @@
+import asyncio
+import logging
+
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+from app.core.config import settings
+from app.core.hasher import password_hasher
+from app.core.redis_pool import get_client
+from app.core.security import create_access_token, decode_token
+from app.db.session import async_session, engine
+from app.schemas.post import PostPage
+from app.services import post as post_service
+
+logger = logging.getLogger("app.warmup")
+
+# bcrypt("warmup") at cost 4: loads the bcrypt backend and starts a hasher
+# worker without spending a full-cost hash in every process.
+WARMUP_HASH = "$2b$04$ddMUpZsBI7FLG7tATRtTl.2yQZfbXPkyL1WqRNx44qonP2OSxzogq"
+
+
+async def _open_db_connection() -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def warm_db() -> None:
+    # Concurrent checkouts so the pool really opens this many connections.
+    n = min(settings.WARMUP_DB_CONNECTIONS, settings.DB_POOL_SIZE)
+    await asyncio.gather(*(_open_db_connection() for _ in range(n)))
+    # First list query: configures the mappers, fills the compiled-statement
+    # cache and runs the page through the response model.
+    configure_mappers()
+    async with async_session() as db:
+        posts, next_cursor = await post_service.list_posts(db, None, limit=1)
+    PostPage.model_validate(
+        {"items": posts, "next_cursor": next_cursor}, from_attributes=True
+    ).model_dump_json()
+
+
+async def warm_redis() -> None:
+    r = get_client()
+    try:
+        await asyncio.gather(*(r.ping() for _ in range(settings.WARMUP_REDIS_CONNECTIONS)))
+    except (RedisError, OSError):
+        logger.warning("redis warm-up failed", exc_info=True)
+
+
+async def warm_auth() -> None:
+    decode_token(create_access_token("0"))
+    await password_hasher.verify("warmup", WARMUP_HASH)
+
+
+async def warm_up() -> None:
+    await asyncio.gather(warm_db(), warm_redis(), warm_auth())
@@ -0,0 +1,224 @@
+"""Versioned schema migrations.
+
+Run once per deploy, before the workers start::
+
+    python -m app.db.migrations          # apply pending migrations
+    python -m app.db.migrations --check  # exit 1 if the database is behind
+
+Workers never change the schema; at startup they read the current version
+once (check_schema_version). The first migrations use IF NOT EXISTS so
+databases created by the old create_all-on-startup are adopted in place.
+Statements are frozen once released: change the schema by appending a new
+migration, never by editing an old one.
+"""
+import argparse
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.db.migrations")
+
+# pg_advisory_xact_lock key; serialises migrators started at the same time.
+LOCK_KEY = 0x656C6963
+
+VERSION_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    applied_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL
+)
+"""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    statements: tuple[str, ...]
+
+
+MIGRATIONS = (
+    Migration(
+        1,
+        "users and posts",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS users (
+                id SERIAL PRIMARY KEY,
+                fullname VARCHAR NOT NULL,
+                email VARCHAR NOT NULL,
+                password_hash VARCHAR NOT NULL,
+                created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS ix_users_id ON users (id)",
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email ON users (email)",
+            """
+            CREATE TABLE IF NOT EXISTS posts (
+                id UUID PRIMARY KEY,
+                author_id INTEGER NOT NULL
+                    REFERENCES users (id) ON DELETE CASCADE,
+                title VARCHAR(100) NOT NULL,
+                content TEXT NOT NULL,
+                is_deleted BOOLEAN NOT NULL,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+                updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL
+            )
+            """,
+        ),
+    ),
+    Migration(
+        2,
+        "generated search_vector with a GIN index over live posts",
+        (
+            """
+            ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+                    || setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+                ) STORED NOT NULL
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ix_post_search_vector_live
+                ON posts USING gin (search_vector) WHERE NOT is_deleted
+            """,
+        ),
+    ),
+    Migration(
+        3,
+        "partial keyset and author feed indexes over live posts",
+        (
+            # create_all never replaced the old (author_id, created_at) index
+            # of the same name, so rebuild it unconditionally.
+            "DROP INDEX IF EXISTS ix_post_author_id_created_at_desc",
+            """
+            CREATE INDEX ix_post_author_id_created_at_desc
+                ON posts (author_id, created_at DESC, id DESC) WHERE NOT is_deleted
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ix_post_created_at_id_live
+                ON posts (created_at DESC, id DESC) WHERE NOT is_deleted
+            """,
+        ),
+    ),
+    Migration(
+        4,
+        "posts_archive and a partial index over deleted posts for the purge job",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS posts_archive (
+                id UUID PRIMARY KEY,
+                author_id INTEGER NOT NULL,
+                title VARCHAR(100) NOT NULL,
+                content TEXT NOT NULL,
+                created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+                deleted_at TIMESTAMP WITH TIME ZONE NOT NULL,
+                archived_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL
+            )
+            """,
+            # On a large posts table, build this first with CREATE INDEX
+            # CONCURRENTLY to avoid blocking writes; IF NOT EXISTS then skips it.
+            """
+            CREATE INDEX IF NOT EXISTS ix_post_deleted_updated_at
+                ON posts (updated_at, id) WHERE is_deleted
+            """,
+        ),
+    ),
+)
+
+HEAD = MIGRATIONS[-1].version
+
+# Only needed by POSTS_SEARCH_BACKEND=trgm, so applied on every upgrade while
+# that backend is selected rather than as a numbered migration.
+TRGM_STATEMENTS = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE INDEX IF NOT EXISTS ix_post_title_trgm_live
+        ON posts USING gin (title gin_trgm_ops) WHERE NOT is_deleted
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_post_content_trgm_live
+        ON posts USING gin (content gin_trgm_ops) WHERE NOT is_deleted
+    """,
+)
+
+
+async def current_version(conn: AsyncConnection) -> int:
+    try:
+        version = await conn.scalar(text("SELECT max(version) FROM schema_version"))
+    except ProgrammingError:
+        # No schema_version table yet.
+        await conn.rollback()
+        return 0
+    return version or 0
+
+
+async def upgrade(conn: AsyncConnection) -> list[int]:
+    """Applies pending migrations in the caller's transaction."""
+    await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": LOCK_KEY})
+    await conn.execute(text(VERSION_TABLE_SQL))
+    version = await conn.scalar(text("SELECT coalesce(max(version), 0) FROM schema_version"))
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version <= version:
+            continue
+        logger.info("applying migration %d: %s", migration.version, migration.description)
+        for statement in migration.statements:
+            await conn.execute(text(statement))
+        await conn.execute(
+            text("INSERT INTO schema_version (version, description) VALUES (:v, :d)"),
+            {"v": migration.version, "d": migration.description},
+        )
+        applied.append(migration.version)
+    if settings.POSTS_SEARCH_BACKEND == "trgm":
+        for statement in TRGM_STATEMENTS:
+            await conn.execute(text(statement))
+    return applied
+
+
+async def check_schema_version(conn: AsyncConnection) -> int:
+    """Startup check: one read of the schema version."""
+    version = await current_version(conn)
+    if version < HEAD:
+        raise RuntimeError(
+            f"database schema is at version {version}, this build needs {HEAD}; "
+            "run `python -m app.db.migrations` first"
+        )
+    if version > HEAD:
+        # Newer schema from a deploy that is rolling out; migrations are
+        # additive, so older workers keep serving.
+        logger.warning("database schema version %d is ahead of %d", version, HEAD)
+    return version
+
+
+async def main(check: bool) -> int:
+    from app.db.session import engine
+
+    try:
+        if check:
+            async with engine.connect() as conn:
+                version = await current_version(conn)
+            print(f"schema version {version}, head {HEAD}")
+            return 0 if version >= HEAD else 1
+        async with engine.begin() as conn:
+            applied = await upgrade(conn)
+        print(f"applied {applied}" if applied else f"schema is up to date ({HEAD})")
+        return 0
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply database schema migrations.")
+    parser.add_argument(
+        "--check", action="store_true", help="only report whether migrations are pending"
+    )
+    logging.basicConfig()
+    logger.setLevel(logging.INFO)
+    raise SystemExit(asyncio.run(main(parser.parse_args().check)))
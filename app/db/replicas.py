@@ -0,0 +1,185 @@
+import asyncio
+import itertools
+import logging
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.requests import HTTPConnection
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.db.session import async_session, engine_kwargs, instrument_engine
+
+logger = logging.getLogger("app.db.replicas")
+
+# Set on successful writes; while it is in the future the client's reads go to
+# the primary so it sees its own changes (read-your-writes).
+PRIMARY_COOKIE = "rw_primary_until"
+# POST endpoints that only read.
+READ_ONLY_POSTS = ("/api/v1/posts:mget",)
+
+LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+read_routing = registry.counter(
+    "db_read_routing_total",
+    "Read sessions by target and reason",
+    ("target", "reason"),
+)
+replica_healthy = registry.gauge(
+    "db_replica_healthy",
+    "1 if the read replica is used for reads",
+    ("replica",),
+)
+replica_lag = registry.gauge(
+    "db_replica_lag_seconds",
+    "Replication lag seen by the last health check",
+    ("replica",),
+)
+
+
+class Replica:
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.engine = create_async_engine(url, **engine_kwargs(url))
+        instrument_engine(self.engine)
+        self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.healthy = True
+        self.lag = 0.0
+        event.listen(self.engine.sync_engine, "handle_error", self._on_error)
+
+    def _on_error(self, context) -> None:
+        # A dropped connection takes the replica out of rotation right away
+        # instead of at the next health check.
+        if context.is_disconnect and self.healthy:
+            logger.warning("replica %s disconnected; routing reads to primary", self.name)
+            self.healthy = False
+
+    async def check(self) -> None:
+        error = None
+        try:
+            async with self.engine.connect() as conn:
+                self.lag = float(await conn.scalar(LAG_SQL))
+            healthy = self.lag <= settings.DB_REPLICA_MAX_LAG_SEC
+        except Exception as e:
+            error = e
+            healthy = False
+        # Logged on transitions only, not on every failed check.
+        if healthy != self.healthy:
+            logger.warning(
+                "replica %s healthy=%s lag=%.1fs error=%r",
+                self.name,
+                healthy,
+                self.lag,
+                error,
+            )
+        self.healthy = healthy
+
+
+replicas = [
+    Replica(f"replica{i}", url) for i, url in enumerate(settings.DATABASE_READ_URLS)
+]
+_round_robin = itertools.count()
+_health_task: asyncio.Task | None = None
+
+
+def _choose() -> Replica | None:
+    healthy = [r for r in replicas if r.healthy]
+    if not healthy:
+        return None
+    start = next(_round_robin)
+    ordered = healthy[start % len(healthy) :] + healthy[: start % len(healthy)]
+    if settings.DB_READ_SELECTION == "least_connections":
+        return min(ordered, key=lambda r: r.engine.pool.checkedout())
+    return ordered[0]
+
+
+def read_sessionmaker(conn: HTTPConnection) -> async_sessionmaker:
+    """Session factory for a read-only request: a healthy replica, else primary."""
+    if not replicas:
+        return async_session
+    try:
+        primary_until = float(conn.cookies.get(PRIMARY_COOKIE, 0))
+    except ValueError:
+        primary_until = 0
+    if primary_until > time.time():
+        read_routing.inc(target="primary", reason="recent_write")
+        return async_session
+    replica = _choose()
+    if replica is None:
+        read_routing.inc(target="primary", reason="no_healthy_replica")
+        return async_session
+    read_routing.inc(target=replica.name, reason="replica")
+    return replica.sessionmaker
+
+
+async def _health_loop() -> None:
+    while True:
+        await asyncio.gather(*(r.check() for r in replicas))
+        await asyncio.sleep(settings.DB_REPLICA_HEALTH_INTERVAL_SEC)
+
+
+async def start() -> None:
+    global _health_task
+    if replicas and _health_task is None:
+        await asyncio.gather(*(r.check() for r in replicas))
+        _health_task = asyncio.create_task(_health_loop())
+
+
+async def stop() -> None:
+    global _health_task
+    if _health_task is not None:
+        _health_task.cancel()
+        try:
+            await _health_task
+        except asyncio.CancelledError:
+            pass
+        _health_task = None
+    for replica in replicas:
+        await replica.engine.dispose()
+
+
+class ReadYourWritesMiddleware:
+    """Marks clients that just wrote so their reads stay on the primary.
+
+    Any successful non-GET/HEAD/OPTIONS request sets a short-lived cookie that
+    read_sessionmaker() honours for DB_READ_YOUR_WRITES_SEC seconds.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in ("GET", "HEAD", "OPTIONS")
+            or scope["path"] in READ_ONLY_POSTS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                window = settings.DB_READ_YOUR_WRITES_SEC
+                cookie = (
+                    f"{PRIMARY_COOKIE}={time.time() + window:.3f}; "
+                    f"Max-Age={int(window) + 1}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", cookie.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+replica_healthy.set_function(lambda: {(r.name,): int(r.healthy) for r in replicas})
+replica_lag.set_function(lambda: {(r.name,): r.lag for r in replicas})
@@ -1,5 +1,100 @@
+import logging
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
 from app.core.config import settings
+from app.core.instrumentation import record_db
+from app.core.metrics import registry
+
+slow_query_logger = logging.getLogger("app.db.slow_query")
+
+pool_checkout_wait = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+)
+pool_connections = registry.gauge(
+    "db_pool_connections",
+    "Database pool connections by state",
+    ("state",),
+)
+slow_queries = registry.counter(
+    "db_slow_queries_total",
+    "Statements slower than DB_SLOW_QUERY_MS",
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_checkout_wait.observe(time.perf_counter() - start)
+
+
+def engine_kwargs(url: str) -> dict:
+    kwargs = {
+        "echo": settings.DB_ECHO,
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if make_url(url).get_driver_name() == "asyncpg":
+        kwargs["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        }
+    return kwargs
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    record_db(elapsed)
+    elapsed_ms = elapsed * 1000
+    if elapsed_ms >= settings.DB_SLOW_QUERY_MS:
+        slow_queries.inc()
+        slow_query_logger.warning(
+            "slow query (%.1f ms): %s", elapsed_ms, " ".join(statement.split())[:1000]
+        )
+
+
+def _handle_error(context):
+    conn = context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def instrument_engine(engine) -> None:
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+engine = create_async_engine(settings.DATABASE_URL, **engine_kwargs(settings.DATABASE_URL))
+instrument_engine(engine)
 async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+
+def pool_stats() -> dict:
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+
+
+pool_connections.set_function(
+    lambda: {(state,): value for state, value in pool_stats().items()}
+)
@@ -1,41 +1,107 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-from app.api.v1 import auth, posts
+from app.api.v1 import auth, posts, users
 from app.core.config import settings
 from app.core.errors import register_handlers
+from app.core import metrics, redis_pool
+from app.core.hasher import password_hasher
+from app.core.compression import CompressionMiddleware
+from app.core.concurrency import ConcurrencyLimitMiddleware
+from app.core.instrumentation import MetricsMiddleware
+from app.core.revocation import revoked_tokens
+from app.core.responses import ORJSONResponse
+from app.core.startup import startup_timer
+from app.core.warmup import warm_up
+from app.db import migrations, replicas
 from app.db.session import engine
-from app.db.base import Base
 import app.models.user
 import app.models.post
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    yield
+    startup_timer.boot()
+    # One version read instead of create_all's catalog introspection in
+    # every worker; schema changes run in `python -m app.db.migrations`.
+    with startup_timer.phase("schema"):
+        if settings.DB_MIGRATE_ON_STARTUP:
+            async with engine.begin() as conn:
+                await migrations.upgrade(conn)
+        else:
+            async with engine.connect() as conn:
+                await migrations.check_schema_version(conn)
+    redis_pool.init_pool()
+    await revoked_tokens.start()
+    password_hasher.start()
+    await replicas.start()
+    if settings.WARMUP_ENABLED:
+        with startup_timer.phase("warmup"):
+            await warm_up()
+    startup_timer.ready()
+    try:
+        yield
+    finally:
+        await revoked_tokens.stop()
+        await replicas.stop()
+        await redis_pool.close_pool()
+        await password_hasher.shutdown()
 
 
-app = FastAPI(title="elice-dev", version="0.1.0", lifespan=lifespan)
+def create_app() -> FastAPI:
+    """Builds the app without touching the database or Redis.
 
-register_handlers(app)
+    Connections are opened in the lifespan, after the server has forked its
+    workers, so ``gunicorn --preload`` can share the imported code.
+    """
+    app = FastAPI(
+        title="elice-dev",
+        version="0.1.0",
+        lifespan=lifespan,
+        default_response_class=(
+            ORJSONResponse if settings.FAST_JSON_RESPONSES else JSONResponse
+        ),
+    )
 
-allow_origins = ["*"] if settings.CORS_ALLOW_ALL else settings.cors_origins_list()
+    register_handlers(app)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=allow_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    allow_origins = ["*"] if settings.CORS_ALLOW_ALL else settings.cors_origins_list()
 
-app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
-app.include_router(posts.router, prefix="/api/v1/posts", tags=["posts"])
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=allow_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["ETag", "Last-Modified", "X-Next-Cursor"],
+    )
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(CompressionMiddleware)
+    if settings.DATABASE_READ_URLS:
+        app.add_middleware(replicas.ReadYourWritesMiddleware)
+    # Inside MetricsMiddleware so shed requests show up as 503s.
+    if settings.CONCURRENCY_LIMIT_ENABLED:
+        app.add_middleware(ConcurrencyLimitMiddleware)
+    app.add_middleware(MetricsMiddleware)
 
+    app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
+    app.include_router(posts.router, prefix="/api/v1/posts", tags=["posts"])
+    app.include_router(posts.actions_router, prefix="/api/v1", tags=["posts"])
+    app.include_router(users.router, prefix="/api/v1/users", tags=["users"])
 
-@app.get("/")
-def root():
-    return {"status": "ready"}
\ No newline at end of file
+    @app.get("/")
+    def root():
+        return {"status": "ready"}
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics_endpoint():
+        return PlainTextResponse(
+            metrics.registry.render(), media_type=metrics.CONTENT_TYPE
+        )
+
+    return app
+
+
+app = create_app()
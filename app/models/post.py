@@ -3,6 +3,7 @@ from datetime import datetime
 
 from sqlalchemy import (
     Boolean,
+    Computed,
     DateTime,
     ForeignKey,
     Index,
@@ -10,11 +11,17 @@ from sqlalchemy import (
     Text,
     func,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.config import settings
 from app.db.base import Base
 
+# Text search configuration baked into the generated search_vector column.
+# "simple" does no stemming, which keeps Korean and mixed-language posts
+# searchable word-for-word.
+SEARCH_TS_CONFIG = "simple"
+
 
 class Post(Base):
     __tablename__ = "posts"
@@ -37,9 +44,83 @@ class Post(Base):
         onupdate=func.now(),
         nullable=False,
     )
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(title, '')), 'A')"
+            f" || setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(content, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     author = relationship("User", back_populates="posts")
 
-    __table_args__ = (
-        Index("ix_post_author_id_created_at_desc", "author_id", "created_at"),
+
+# Backs per-author feeds: WHERE author_id = ? ORDER BY created_at DESC, id DESC.
+Index(
+    "ix_post_author_id_created_at_desc",
+    Post.author_id,
+    Post.created_at.desc(),
+    Post.id.desc(),
+    postgresql_where=~Post.is_deleted,
+)
+
+# Backs keyset pagination: ORDER BY created_at DESC, id DESC over live posts.
+Index(
+    "ix_post_created_at_id_live",
+    Post.created_at.desc(),
+    Post.id.desc(),
+    postgresql_where=~Post.is_deleted,
+)
+
+Index(
+    "ix_post_search_vector_live",
+    Post.search_vector,
+    postgresql_using="gin",
+    postgresql_where=~Post.is_deleted,
+)
+
+# Backs the purge job: deleted posts in deletion order (soft delete stamps
+# updated_at). Small, since it only holds dead rows.
+Index(
+    "ix_post_deleted_updated_at",
+    Post.updated_at,
+    Post.id,
+    postgresql_where=Post.is_deleted,
+)
+
+
+class PostArchive(Base):
+    """Soft-deleted posts moved out of ``posts`` by the purge job."""
+
+    __tablename__ = "posts_archive"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    author_id: Mapped[int] = mapped_column(nullable=False)
+    title: Mapped[str] = mapped_column(String(100), nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+# Trigram indexes need the pg_trgm extension, so they are only declared when
+# that backend is selected (app.db.migrations creates the extension).
+if settings.POSTS_SEARCH_BACKEND == "trgm":
+    Index(
+        "ix_post_title_trgm_live",
+        Post.title,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+        postgresql_where=~Post.is_deleted,
+    )
+    Index(
+        "ix_post_content_trgm_live",
+        Post.content,
+        postgresql_using="gin",
+        postgresql_ops={"content": "gin_trgm_ops"},
+        postgresql_where=~Post.is_deleted,
     )
\ No newline at end of file
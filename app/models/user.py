@@ -1,6 +1,6 @@
 import datetime
 from sqlalchemy import func
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
 
@@ -15,3 +15,5 @@ class User(Base):
     created_at: Mapped[datetime.datetime] = mapped_column(
         server_default=func.now(),
     )
+
+    posts = relationship("Post", back_populates="author")
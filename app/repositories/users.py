@@ -6,6 +6,9 @@ from app.models.user import User
 
 
 class UserRepository:
+    async def get_by_id(self, db: AsyncSession, user_id: int) -> User | None:
+        return await db.get(User, user_id)
+
     async def get_by_email(self, db: AsyncSession, email: str) -> User | None:
         stmt = select(User).where(User.email == email)
         result = await db.execute(stmt)
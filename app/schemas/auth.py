@@ -16,3 +16,11 @@ class UserOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class SessionOut(BaseModel):
+    # Family id: the same for every refresh of one login.
+    id: str
+    issued_at: datetime.datetime
+    expires_at: datetime.datetime
+    current: bool
@@ -1,16 +1,21 @@
 import uuid
 from datetime import datetime
+from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
 
 
 class PostCreate(BaseModel):
-    title: str
+    # Matches posts.title VARCHAR(100), so bad titles fail validation rather
+    # than the INSERT (and, in a batch, the whole statement).
+    title: str = Field(max_length=100)
     content: str
 
 
 class PostUpdate(BaseModel):
-    title: str | None = None
+    title: str | None = Field(None, max_length=100)
     content: str | None = None
 
 
@@ -23,4 +28,51 @@ class PostOut(BaseModel):
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class PostSummary(BaseModel):
+    id: uuid.UUID
+    author_id: int
+    title: str
+    excerpt: str
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class PostPage(BaseModel):
+    items: list[PostOut]
+    next_cursor: str | None = None
+
+
+class PostSummaryPage(BaseModel):
+    items: list[PostSummary]
+    next_cursor: str | None = None
+
+
+class PostBatchCreate(BaseModel):
+    # Items are validated one by one so a bad item is reported, not fatal.
+    items: list[Any] = Field(min_length=1, max_length=settings.POST_BATCH_MAX_ITEMS)
+
+
+class PostBatchItem(BaseModel):
+    index: int
+    post: PostOut | None = None
+    errors: list[dict] | None = None
+
+
+class PostBatchResult(BaseModel):
+    created: int
+    items: list[PostBatchItem]
+
+
+class PostIds(BaseModel):
+    ids: list[uuid.UUID] = Field(min_length=1, max_length=settings.POST_BATCH_MAX_ITEMS)
+
+
+class PostMultiGet(BaseModel):
+    items: list[PostOut]
+    missing: list[uuid.UUID]
@@ -2,10 +2,10 @@ from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.hasher import password_hasher
 from app.core.security import (
     create_access_jwt,
     issue_refresh_token,
-    pwd_context,
     revoke_refresh_token,
 )
 from app.errors.exceptions import Conflict, Unauthorized
@@ -15,7 +15,7 @@ from app.schemas.auth import SignUpIn, UserOut
 
 class AuthService:
     async def signup(self, db: AsyncSession, payload: SignUpIn) -> UserOut:
-        password_hash = pwd_context.hash(payload.password)
+        password_hash = await password_hasher.hash(payload.password)
         user = await users_repo.create(
             db,
             fullname=payload.fullname,
@@ -30,7 +30,9 @@ class AuthService:
         self, db: AsyncSession, redis: Redis, email: str, password: str
     ) -> dict:
         user = await users_repo.get_by_email(db, email)
-        if not user or not pwd_context.verify(password, user.password_hash):
+        if not user or not await password_hasher.verify(
+            password, user.password_hash
+        ):
             raise Unauthorized("Invalid email or password")
 
         access_token = create_access_jwt(
@@ -1,7 +1,26 @@
-from sqlalchemy import select
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from sqlalchemy import (
+    Row,
+    any_,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement, Select
 
-from app.models.post import Post
+from app.core.config import settings
+from app.core.pagination import encode_cursor
+from app.models.post import SEARCH_TS_CONFIG, Post
 from app.schemas.post import PostCreate, PostUpdate
 
 
@@ -15,6 +34,20 @@ async def create_post(
     return post
 
 
+async def create_posts(
+    db: AsyncSession, author_id: int, items: list[PostCreate]
+) -> list[Post]:
+    # One multi-row INSERT ... RETURNING and one commit for the whole batch;
+    # rows come back in the order of `items`.
+    if not items:
+        return []
+    stmt = insert(Post).returning(Post, sort_by_parameter_order=True)
+    params = [{"author_id": author_id, **item.model_dump()} for item in items]
+    posts = (await db.scalars(stmt, params)).all()
+    await db.commit()
+    return posts
+
+
 async def get_post(
     db: AsyncSession, post_id: str, include_deleted: bool = False
 ) -> Post | None:
@@ -24,52 +57,228 @@ async def get_post(
     return await db.scalar(stmt)
 
 
-async def list_posts(
-    db: AsyncSession, q: str | None, skip: int = 0, limit: int = 20
-) -> list[Post]:
-    stmt = select(Post).where(Post.is_deleted == False)
+async def get_posts(db: AsyncSession, post_ids: list[uuid.UUID]) -> list[Post]:
+    # A single array parameter (id = ANY($1)) keeps one prepared statement for
+    # every batch size, unlike an expanding IN list.
+    ids = literal(post_ids, ARRAY(Post.id.type))
+    stmt = select(Post).where(Post.id == any_(ids), Post.is_deleted == False)
+    return (await db.scalars(stmt)).all()
+
+
+async def get_post_version(
+    db: AsyncSession, post_id: uuid.UUID
+) -> datetime | None:
+    # updated_at only: enough to answer a conditional GET without reading
+    # (or detoasting) the content.
+    return await db.scalar(
+        select(Post.updated_at).where(Post.id == post_id, Post.is_deleted == False)
+    )
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def apply_search(stmt: Select, q: str) -> tuple[Select, ColumnElement | None]:
+    """Filter ``stmt`` by ``q``; returns the statement and a relevance score."""
+    backend = settings.POSTS_SEARCH_BACKEND
+    if backend == "fts":
+        query = func.websearch_to_tsquery(
+            literal_column(f"'{SEARCH_TS_CONFIG}'::regconfig"), q
+        )
+        stmt = stmt.where(Post.search_vector.op("@@")(query))
+        return stmt, func.ts_rank_cd(Post.search_vector, query)
+    if backend == "trgm":
+        pattern = f"%{_escape_like(q)}%"
+        stmt = stmt.where(
+            or_(
+                Post.title.ilike(pattern, escape="\\"),
+                Post.content.ilike(pattern, escape="\\"),
+            )
+        )
+        score = func.greatest(
+            func.similarity(Post.title, q), func.word_similarity(q, Post.content)
+        )
+        return stmt, score
+    return stmt.where(Post.title.ilike(f"%{q}%")), None
+
+
+def summary_columns() -> list[ColumnElement]:
+    # substr() lets Postgres fetch only the leading slice of an uncompressed
+    # TOASTed content value instead of detoasting the whole body.
+    excerpt = func.substr(Post.content, 1, settings.POST_EXCERPT_CHARS)
+    return [
+        Post.id,
+        Post.author_id,
+        Post.title,
+        excerpt.label("excerpt"),
+        Post.created_at,
+        Post.updated_at,
+    ]
+
+
+def _live_posts_stmt(summary: bool, author_id: int | None) -> Select:
+    stmt = select(*summary_columns()) if summary else select(Post)
+    stmt = stmt.where(Post.is_deleted == False)
+    if author_id is not None:
+        stmt = stmt.where(Post.author_id == author_id)
+    return stmt
+
+
+def list_posts_stmt(
+    q: str | None,
+    skip: int = 0,
+    limit: int = 20,
+    after: tuple[datetime, uuid.UUID] | None = None,
+    ranked: bool = True,
+    summary: bool = False,
+    author_id: int | None = None,
+) -> tuple[Select, bool]:
+    # `after` is a decoded keyset cursor; when given it replaces `skip`.
+    # Search results are ranked by relevance unless `ranked` is off; keyset
+    # paging needs newest-first order so the cursor stays valid.
+    # `summary` selects summary_columns() rows instead of whole Post objects.
+    stmt = _live_posts_stmt(summary, author_id)
+    rank = None
     if q:
-        stmt = stmt.where(Post.title.ilike(f"%{q}%"))
-    stmt = stmt.offset(skip).limit(limit).order_by(Post.created_at.desc())
+        stmt, rank = apply_search(stmt, q)
+    if after is not None or not ranked:
+        rank = None
+    if after is not None:
+        created_at, post_id = after
+        stmt = stmt.where(
+            tuple_(Post.created_at, Post.id)
+            < tuple_(
+                literal(created_at, Post.created_at.type),
+                literal(post_id, Post.id.type),
+            )
+        )
+    else:
+        stmt = stmt.offset(skip)
+    order_by = [Post.created_at.desc(), Post.id.desc()]
+    if rank is not None:
+        order_by.insert(0, rank.desc())
+    # One extra row tells us whether a next page exists.
+    stmt = stmt.limit(limit + 1).order_by(*order_by)
+    return stmt, rank is not None
+
+
+async def list_posts(
+    db: AsyncSession,
+    q: str | None,
+    skip: int = 0,
+    limit: int = 20,
+    after: tuple[datetime, uuid.UUID] | None = None,
+    ranked: bool = True,
+    summary: bool = False,
+    author_id: int | None = None,
+) -> tuple[list[Post] | list[Row], str | None]:
+    stmt, is_ranked = list_posts_stmt(
+        q, skip, limit, after, ranked, summary, author_id
+    )
     result = await db.execute(stmt)
-    return result.scalars().all()
+    posts = result.all() if summary else result.scalars().all()
+    if is_ranked:
+        return posts[:limit], None
+    if len(posts) <= limit:
+        return posts, None
+    posts = posts[:limit]
+    last = posts[-1]
+    return posts, encode_cursor(last.created_at, last.id)
 
 
-async def update_post(
-    db: AsyncSession, post_id: str, author_id: int, data: PostUpdate
-) -> Post:
-    stmt = (
-        select(Post)
-        .where(Post.id == post_id, Post.is_deleted == False)
-        .with_for_update()
+def export_posts_stmt(
+    q: str | None, summary: bool = False, author_id: int | None = None
+) -> Select:
+    # Same filters as list_posts, unpaged, in index order (newest first).
+    stmt = _live_posts_stmt(summary, author_id)
+    if q:
+        stmt, _ = apply_search(stmt, q)
+    return stmt.order_by(Post.created_at.desc(), Post.id.desc())
+
+
+async def stream_posts(
+    db: AsyncSession, stmt: Select, summary: bool = False, fetch_size: int = 1000
+) -> AsyncIterator[list[Post] | list[Row]]:
+    """Yields result batches of ``fetch_size`` rows from a server-side cursor."""
+    result = await db.stream(stmt.execution_options(yield_per=fetch_size))
+    if not summary:
+        result = result.scalars()
+    async for batch in result.partitions():
+        yield batch
+
+
+class StalePostError(Exception):
+    """The post changed since the version named by If-Match."""
+
+
+async def _raise_if_not_owner(
+    db: AsyncSession, post_id: str, author_id: int
+) -> bool:
+    # Only runs when a guarded UPDATE matched nothing: tells a missing post
+    # apart from one owned by someone else. True if a live post remains.
+    owner_id = await db.scalar(
+        select(Post.author_id).where(Post.id == post_id, Post.is_deleted == False)
     )
-    post = await db.scalar(stmt)
-    if not post:
-        return None
-    if post.author_id != author_id:
+    if owner_id is not None and owner_id != author_id:
         raise PermissionError("Not the owner")
+    return owner_id is not None
+
 
+async def update_post(
+    db: AsyncSession,
+    post_id: str,
+    author_id: int,
+    data: PostUpdate,
+    if_versions: list[datetime] | None = None,
+) -> Post | None:
+    # `if_versions` (from If-Match) restricts the update to those updated_at
+    # values; the check and the write are one statement, so no row lock is
+    # needed for optimistic concurrency.
     update_data = data.model_dump(exclude_unset=True)
-    for k, v in update_data.items():
-        setattr(post, k, v)
+    if not update_data:
+        post = await get_post(db, post_id)
+        if post and post.author_id != author_id:
+            raise PermissionError("Not the owner")
+        if post and if_versions is not None and post.updated_at not in if_versions:
+            raise StalePostError("Post was modified")
+        return post
 
+    stmt = (
+        update(Post)
+        .where(
+            Post.id == post_id,
+            Post.author_id == author_id,
+            Post.is_deleted == False,
+        )
+        .values(**update_data)
+        .returning(Post)
+    )
+    if if_versions is not None:
+        stmt = stmt.where(Post.updated_at.in_(if_versions))
+    post = (await db.execute(stmt)).scalar_one_or_none()
     await db.commit()
-    await db.refresh(post)
+    if post is None and await _raise_if_not_owner(db, post_id, author_id):
+        if if_versions is not None:
+            # Live and ours, so only the If-Match version check failed.
+            raise StalePostError("Post was modified")
     return post
 
 
 async def delete_post(db: AsyncSession, post_id: str, author_id: int) -> bool:
     stmt = (
-        select(Post)
-        .where(Post.id == post_id, Post.is_deleted == False)
-        .with_for_update()
+        update(Post)
+        .where(
+            Post.id == post_id,
+            Post.author_id == author_id,
+            Post.is_deleted == False,
+        )
+        .values(is_deleted=True)
+        .returning(Post.id)
     )
-    post = await db.scalar(stmt)
-    if not post:
-        return False
-    if post.author_id != author_id:
-        raise PermissionError("Not the owner")
-
-    post.is_deleted = True
+    deleted_id = (await db.execute(stmt)).scalar_one_or_none()
     await db.commit()
-    return True
\ No newline at end of file
+    if deleted_id is None:
+        await _raise_if_not_owner(db, post_id, author_id)
+        return False
+    return True
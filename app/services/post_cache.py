@@ -0,0 +1,136 @@
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core import compression
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.singleflight import SingleFlight
+
+# Stored instead of a body when the post does not exist (negative caching).
+NOT_FOUND = "\x00404"
+
+cache_requests = registry.counter(
+    "post_cache_requests_total",
+    "Single-post cache lookups by result",
+    ("result",),
+)
+cache_coalesced = registry.counter(
+    "post_cache_coalesced_total",
+    "Cache misses that waited on an in-flight load instead of querying the DB",
+)
+
+_flight = SingleFlight(on_coalesced=cache_coalesced.inc)
+
+
+@dataclass(frozen=True)
+class CachedPost:
+    """A post's JSON body with the validator it was built from."""
+
+    updated_at: datetime
+    body: str
+
+
+def _key(post_id: uuid.UUID | str) -> str:
+    return f"post:{post_id}"
+
+
+# Stored as "<updated_at ISO>\n<body>": the JSON body never contains a raw
+# newline, and a hit reads its validator without parsing the body.
+def _encode(post: CachedPost) -> str:
+    return f"{post.updated_at.isoformat()}\n{post.body}"
+
+
+def _decode(value: str) -> CachedPost | None:
+    updated_at, sep, body = value.partition("\n")
+    if not sep:
+        return None  # bare body from an older release; reload it
+    return CachedPost(datetime.fromisoformat(updated_at), body)
+
+
+async def get(r: Redis, post_id: uuid.UUID | str) -> CachedPost | str | None:
+    """The cached post, NOT_FOUND for a cached miss, or None if not cached."""
+    try:
+        value = await r.get(_key(post_id))
+    except RedisError:
+        cache_requests.inc(result="error")
+        return None
+    if value == NOT_FOUND:
+        cache_requests.inc(result="negative_hit")
+        return NOT_FOUND
+    cached = _decode(value) if value is not None else None
+    cache_requests.inc(result="miss" if cached is None else "hit")
+    return cached
+
+
+async def save(
+    r: Redis, post_id: uuid.UUID | str, post: CachedPost | None
+) -> None:
+    try:
+        if post is None:
+            await r.setex(_key(post_id), settings.POST_CACHE_NEGATIVE_TTL_SEC, NOT_FOUND)
+        else:
+            await r.setex(_key(post_id), settings.POST_CACHE_TTL_SEC, _encode(post))
+    except RedisError:
+        pass
+
+
+async def invalidate(r: Redis, post_id: uuid.UUID | str) -> None:
+    try:
+        await r.delete(_key(post_id))
+    except RedisError:
+        pass
+
+
+async def get_or_load(
+    r: Redis,
+    post_id: uuid.UUID | str,
+    load: Callable[[], Awaitable[CachedPost | None]],
+) -> CachedPost | None:
+    """Cached post for ``post_id``, or None if the post does not exist.
+
+    Concurrent misses for the same id share a single ``load`` call.
+    """
+    cached = await get(r, post_id)
+    if cached is not None:
+        return None if cached == NOT_FOUND else cached
+
+    async def fill() -> CachedPost | None:
+        post = await load()
+        await save(r, post_id, post)
+        return post
+
+    return await _flight.do(str(post_id), fill)
+
+
+# Compressed bodies, keyed by (ETag, encoding). The ETag names the post version
+# the body was built from, so entries never need invalidating; an edited post
+# simply gets a new key and the old one ages out of the LRU. Kept in-process
+# because the shared Redis pool decodes responses to str.
+_variants: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+
+variant_requests = registry.counter(
+    "post_cache_variant_requests_total",
+    "Compressed post body lookups by result",
+    ("result",),
+)
+
+
+def compressed_variant(etag: str, encoding: str, body: str) -> bytes:
+    key = (etag, encoding)
+    data = _variants.get(key)
+    if data is not None:
+        variant_requests.inc(result="hit")
+        _variants.move_to_end(key)
+        return data
+    variant_requests.inc(result="miss")
+    data = compression.compress(body.encode(), encoding)
+    _variants[key] = data
+    while len(_variants) > settings.POST_CACHE_VARIANTS_MAX:
+        _variants.popitem(last=False)
+    return data
@@ -0,0 +1,72 @@
+import csv
+import io
+import zlib
+from collections.abc import AsyncIterator
+from typing import Literal
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.schemas.post import PostOut, PostSummary
+from app.services.post import stream_posts
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+exported_rows = registry.counter(
+    "post_export_rows_total",
+    "Rows streamed by GET /posts/export",
+    ("format",),
+)
+
+_adapters = {False: TypeAdapter(list[PostOut]), True: TypeAdapter(list[PostSummary])}
+
+
+async def export_chunks(
+    sessionmaker: async_sessionmaker,
+    stmt: Select,
+    summary: bool,
+    fmt: ExportFormat,
+) -> AsyncIterator[bytes]:
+    """Encodes ``stmt`` rows batch by batch; memory is bounded by the fetch size.
+
+    Opens its own session: the response body is produced after the request's
+    dependencies may already have been closed.
+    """
+    schema = PostSummary if summary else PostOut
+    adapter = _adapters[summary]
+    fields = list(schema.model_fields)
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+        writer.writeheader()
+        yield buffer.getvalue().encode()
+
+    async with sessionmaker() as db:
+        async for batch in stream_posts(
+            db, stmt, summary, settings.POST_EXPORT_FETCH_SIZE
+        ):
+            items = adapter.validate_python(batch, from_attributes=True)
+            if fmt == "ndjson":
+                chunk = b"".join(
+                    item.model_dump_json().encode() + b"\n" for item in items
+                )
+            else:
+                buffer = io.StringIO()
+                writer = csv.DictWriter(buffer, fieldnames=fields)
+                writer.writerows(adapter.dump_python(items, mode="json"))
+                chunk = buffer.getvalue().encode()
+            exported_rows.inc(len(items), format=fmt)
+            yield chunk
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    async for chunk in chunks:
+        # Sync-flush each batch so the client receives it now, not at the end.
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
@@ -0,0 +1,143 @@
+"""Moves long-deleted posts out of ``posts`` in small batches.
+
+    python -m app.services.post_purge                  # POST_PURGE_* settings
+    python -m app.services.post_purge --mode delete --retention-days 90
+
+Soft delete stamps updated_at, so it doubles as the deletion time. Each batch
+is one short transaction that locks at most the batch's rows (rows held by
+other transactions are skipped) and walks ix_post_deleted_updated_at from a
+keyset cursor, so index entries left dead by earlier batches are not scanned
+again. The pause between batches leaves room for autovacuum and replicas.
+"""
+import argparse
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Literal
+
+from sqlalchemy import Select, delete, insert, literal, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.models.post import Post, PostArchive
+import app.models.user  # noqa: F401
+
+logger = logging.getLogger("app.post_purge")
+
+PurgeMode = Literal["archive", "delete"]
+
+# Fail a batch instead of queueing behind a table lock (e.g. a migration).
+LOCK_TIMEOUT = "2s"
+
+
+def purge_batch_stmt(
+    cutoff: datetime,
+    batch_size: int,
+    after: tuple[datetime, uuid.UUID] | None = None,
+) -> Select:
+    stmt = select(Post.id).where(Post.is_deleted, Post.updated_at < cutoff)
+    if after is not None:
+        deleted_at, post_id = after
+        stmt = stmt.where(
+            tuple_(Post.updated_at, Post.id)
+            > tuple_(
+                literal(deleted_at, Post.updated_at.type),
+                literal(post_id, Post.id.type),
+            )
+        )
+    return (
+        stmt.order_by(Post.updated_at, Post.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+
+
+def purge_stmt(
+    mode: PurgeMode,
+    cutoff: datetime,
+    batch_size: int,
+    after: tuple[datetime, uuid.UUID] | None = None,
+):
+    """One batch; returns (deleted_at, id) of every purged post."""
+    batch = purge_batch_stmt(cutoff, batch_size, after).cte("batch")
+    removed = delete(Post).where(Post.id.in_(select(batch.c.id)))
+    if mode == "delete":
+        return removed.returning(Post.updated_at, Post.id)
+    moved = removed.returning(
+        Post.id,
+        Post.author_id,
+        Post.title,
+        Post.content,
+        Post.created_at,
+        Post.updated_at,
+    ).cte("moved")
+    return (
+        insert(PostArchive)
+        .from_select(
+            ["id", "author_id", "title", "content", "created_at", "deleted_at"],
+            select(
+                moved.c.id,
+                moved.c.author_id,
+                moved.c.title,
+                moved.c.content,
+                moved.c.created_at,
+                moved.c.updated_at,
+            ),
+        )
+        .returning(PostArchive.deleted_at, PostArchive.id)
+    )
+
+
+async def purge_deleted_posts(
+    engine: AsyncEngine,
+    mode: PurgeMode,
+    retention_days: int,
+    batch_size: int,
+    pause_sec: float,
+    max_batches: int | None = None,
+) -> int:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    after = None
+    purged = batches = 0
+    while max_batches is None or batches < max_batches:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+            rows = (await conn.execute(purge_stmt(mode, cutoff, batch_size, after))).all()
+        if not rows:
+            break
+        purged += len(rows)
+        batches += 1
+        after = max(tuple(row) for row in rows)
+        logger.info("batch %d: %s %d posts (total %d)", batches, mode, len(rows), purged)
+        await asyncio.sleep(pause_sec)
+    return purged
+
+
+async def main(args) -> None:
+    from app.db.session import engine
+
+    try:
+        purged = await purge_deleted_posts(
+            engine,
+            args.mode,
+            args.retention_days,
+            args.batch_size,
+            args.pause,
+            args.max_batches,
+        )
+        print(f"{args.mode}: {purged} posts deleted more than {args.retention_days} days ago")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive or delete long-deleted posts.")
+    parser.add_argument("--mode", choices=["archive", "delete"], default=settings.POST_PURGE_MODE)
+    parser.add_argument("--retention-days", type=int, default=settings.POST_PURGE_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.POST_PURGE_BATCH_SIZE)
+    parser.add_argument("--pause", type=float, default=settings.POST_PURGE_PAUSE_SEC)
+    parser.add_argument("--max-batches", type=int, help="stop after this many batches")
+    logging.basicConfig()
+    logger.setLevel(logging.INFO)
+    asyncio.run(main(parser.parse_args()))
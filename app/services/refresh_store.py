@@ -1,12 +1,150 @@
 import json
+import time
 
 from redis.asyncio import Redis
 
+from app.core.metrics import registry
 
-async def save_refresh(r: Redis, jti: str, user_id: str, ttl_sec: int) -> None:
+# rotate_refresh results
+ROTATED = 1
+INVALID = 0
+REUSED = -1
+REVOKED = -2
+
+rotations = registry.counter(
+    "refresh_rotations_total",
+    "Refresh token rotations by result",
+    ("result",),
+)
+
+# Per-user session index: rts:{uid} is a ZSET of the user's live refresh
+# jtis scored by expiry (epoch seconds), so a user's sessions can be listed
+# or revoked without scanning rt:*. Every write to rt:* keeps it in step;
+# expired members are pruned lazily.
+#
+# Scripts only touch keys passed in KEYS, so script-key ACLs hold. The keys of
+# one call still span hash slots (rt:{jti} vs rts:{uid}), as do the MULTI
+# pipelines below: the store expects a single Redis node, not Redis Cluster.
+
+# rtb:{uid} holds the time of the user's last logout-all. Sessions issued
+# before it, including ones from before rts:{uid} existed (not indexed, and
+# stored without an iat), are refused on rotation.
+
+# KEYS: rt:{old}, rt:{new}, rtu:{old} (used marker), rtf:{family} (current jti),
+#       rts:{uid}, rtb:{uid}
+# ARGV: new session value, ttl seconds, new jti, old jti, now, new expiry
+#
+# A consumed token leaves a used marker behind. Presenting it again means the
+# token leaked; the caller then revokes the family's current session with
+# REVOKE_FAMILY_LUA.
+ROTATE_LUA = """
+local old = redis.call('GET', KEYS[1])
+local revoked_before = redis.call('GET', KEYS[6])
+if old and revoked_before then
+    local iat = cjson.decode(old).iat
+    if not iat or iat < tonumber(revoked_before) then
+        redis.call('DEL', KEYS[1])
+        redis.call('ZREM', KEYS[5], ARGV[4])
+        return -2
+    end
+end
+if old then
+    redis.call('DEL', KEYS[1])
+    redis.call('SET', KEYS[2], ARGV[1], 'EX', ARGV[2])
+    redis.call('SET', KEYS[3], '1', 'EX', ARGV[2])
+    redis.call('SET', KEYS[4], ARGV[3], 'EX', ARGV[2])
+    redis.call('ZREM', KEYS[5], ARGV[4])
+    redis.call('ZADD', KEYS[5], ARGV[6], ARGV[3])
+    redis.call('ZREMRANGEBYSCORE', KEYS[5], '-inf', ARGV[5])
+    redis.call('EXPIRE', KEYS[5], ARGV[2])
+    return 1
+end
+if redis.call('EXISTS', KEYS[3]) == 1 then
+    return -1
+end
+return 0
+"""
+
+# KEYS: rtf:{family}, rt:{jti}, rts:{uid}
+# ARGV: jti read from rtf:{family}
+# Revokes the family's current session if it is still ARGV[1]; returns 0 when
+# the family moved on in the meantime so the caller re-reads and retries.
+REVOKE_FAMILY_LUA = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[2])
+redis.call('ZREM', KEYS[3], ARGV[1])
+redis.call('DEL', KEYS[1])
+return 1
+"""
+
+# KEYS: rts:{uid}, then rt:{jti} for each jti in ARGV
+# ARGV: the members of rts:{uid} as read by the caller
+# Deletes every listed session and returns them as a flat
+# [jti, value, jti, value, ...] list; nil if rts:{uid} changed since it was
+# read, so the caller re-reads and retries.
+REVOKE_ALL_LUA = """
+local members = redis.call('ZRANGE', KEYS[1], 0, -1)
+if #members ~= #ARGV then
+    return false
+end
+for i, jti in ipairs(members) do
+    if jti ~= ARGV[i] then
+        return false
+    end
+end
+local out = {}
+for i, jti in ipairs(ARGV) do
+    local value = redis.call('GET', KEYS[i + 1])
+    if value then
+        redis.call('DEL', KEYS[i + 1])
+        out[#out + 1] = jti
+        out[#out + 1] = value
+    end
+end
+redis.call('DEL', KEYS[1])
+return out
+"""
+
+
+def _sessions_key(user_id: str) -> str:
+    return f"rts:{user_id}"
+
+
+def _revoked_before_key(user_id: str) -> str:
+    return f"rtb:{user_id}"
+
+
+def _session_value(user_id: str, family_id: str, issued_at: float) -> str:
+    return json.dumps({"uid": user_id, "fid": family_id, "iat": issued_at})
+
+
+def _session(jti: str, value: str, expires_at: float | None = None) -> dict:
+    data = json.loads(value)
+    return {
+        "jti": jti,
+        "family_id": data.get("fid", jti),
+        "issued_at": data.get("iat"),
+        "expires_at": expires_at,
+    }
+
+
+async def save_refresh(
+    r: Redis, jti: str, user_id: str, ttl_sec: int, family_id: str | None = None
+) -> None:
     key = f"rt:{jti}"
-    value = json.dumps({"uid": user_id})
-    await r.setex(key, ttl_sec, value)
+    sessions_key = _sessions_key(user_id)
+    now = time.time()
+    value = _session_value(user_id, family_id or jti, now)
+    async with r.pipeline(transaction=True) as pipe:
+        pipe.setex(key, ttl_sec, value)
+        if family_id:
+            pipe.setex(f"rtf:{family_id}", ttl_sec, jti)
+        pipe.zadd(sessions_key, {jti: now + ttl_sec})
+        pipe.zremrangebyscore(sessions_key, "-inf", now)
+        pipe.expire(sessions_key, ttl_sec)
+        await pipe.execute()
 
 
 async def exists_refresh(r: Redis, jti: str) -> bool:
@@ -14,6 +152,104 @@ async def exists_refresh(r: Redis, jti: str) -> bool:
     return await r.exists(key) > 0
 
 
-async def delete_refresh(r: Redis, jti: str) -> None:
+async def delete_refresh(r: Redis, jti: str, user_id: str) -> None:
     key = f"rt:{jti}"
-    await r.delete(key)
\ No newline at end of file
+    async with r.pipeline(transaction=True) as pipe:
+        pipe.delete(key)
+        pipe.zrem(_sessions_key(user_id), jti)
+        await pipe.execute()
+
+
+async def list_sessions(r: Redis, user_id: str) -> list[dict]:
+    """The user's live sessions, newest first; O(sessions of that user)."""
+    key = _sessions_key(user_id)
+    async with r.pipeline(transaction=True) as pipe:
+        pipe.zremrangebyscore(key, "-inf", time.time())
+        pipe.zrange(key, 0, -1, withscores=True)
+        _, entries = await pipe.execute()
+    if not entries:
+        return []
+    values = await r.mget([f"rt:{jti}" for jti, _ in entries])
+    sessions, stale = [], []
+    for (jti, expires_at), value in zip(entries, values):
+        if value is None:
+            stale.append(jti)
+        else:
+            sessions.append(_session(jti, value, expires_at))
+    if stale:
+        await r.zrem(key, *stale)
+    return sorted(sessions, key=lambda s: s["issued_at"] or 0, reverse=True)
+
+
+async def revoke_sessions(r: Redis, user_id: str, ttl_sec: int) -> list[dict]:
+    """Deletes all of the user's refresh sessions atomically; returns them.
+
+    Also records the revocation time for ``ttl_sec`` (the refresh TTL), so
+    sessions missing from the index are refused by rotate_refresh.
+    """
+    await r.set(_revoked_before_key(user_id), time.time(), ex=ttl_sec)
+    key = _sessions_key(user_id)
+    script = r.register_script(REVOKE_ALL_LUA)
+    while True:
+        jtis = await r.zrange(key, 0, -1)
+        flat = await script(keys=[key, *(f"rt:{jti}" for jti in jtis)], args=jtis)
+        if flat is not None:
+            return [_session(jti, value) for jti, value in zip(flat[::2], flat[1::2])]
+
+
+async def _revoke_family(r: Redis, family_id: str, user_id: str) -> None:
+    family_key = f"rtf:{family_id}"
+    script = r.register_script(REVOKE_FAMILY_LUA)
+    while (current := await r.get(family_key)) is not None:
+        keys = [family_key, f"rt:{current}", _sessions_key(user_id)]
+        if await script(keys=keys, args=[current]):
+            return
+
+
+async def rotate_refresh(
+    r: Redis,
+    old_jti: str,
+    new_jti: str,
+    user_id: str,
+    family_id: str,
+    ttl_sec: int,
+) -> int:
+    """Consume ``rt:{old_jti}`` and store ``rt:{new_jti}`` in one round trip.
+
+    Returns ROTATED, INVALID (unknown or expired), REUSED (already rotated;
+    the whole family has been revoked) or REVOKED (issued before the user's
+    last logout-all; the session is deleted).
+    """
+    script = r.register_script(ROTATE_LUA)
+    now = time.time()
+    result = int(
+        await script(
+            keys=[
+                f"rt:{old_jti}",
+                f"rt:{new_jti}",
+                f"rtu:{old_jti}",
+                f"rtf:{family_id}",
+                _sessions_key(user_id),
+                _revoked_before_key(user_id),
+            ],
+            args=[
+                _session_value(user_id, family_id, now),
+                ttl_sec,
+                new_jti,
+                old_jti,
+                now,
+                now + ttl_sec,
+            ],
+        )
+    )
+    if result == REUSED:
+        await _revoke_family(r, family_id, user_id)
+    rotations.inc(
+        result={
+            ROTATED: "rotated",
+            INVALID: "invalid",
+            REUSED: "reused",
+            REVOKED: "revoked",
+        }[result]
+    )
+    return result
@@ -0,0 +1,64 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+
+def percentile(sorted_samples: list[float], pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, round(pct / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def latency_summary(samples_ms: list[float]) -> dict:
+    s = sorted(samples_ms)
+    if not s:
+        return {"count": 0}
+    return {
+        "count": len(s),
+        "mean_ms": round(statistics.fmean(s), 3),
+        "p50_ms": round(percentile(s, 50), 3),
+        "p95_ms": round(percentile(s, 95), 3),
+        "p99_ms": round(percentile(s, 99), 3),
+        "max_ms": round(s[-1], 3),
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(report: dict, out: str | None) -> None:
+    report = {
+        "meta": {
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        **report,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if out:
+        with open(out, "w") as f:
+            f.write(output + "\n")
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.ms = (time.perf_counter() - self.start) * 1000
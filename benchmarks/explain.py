@@ -0,0 +1,138 @@
+"""Checks that list queries are planned as index scans, not sort + seq scan.
+
+Seeds a throwaway schema with posts spread over many authors, then runs
+EXPLAIN on the statements ``post_service.list_posts_stmt`` builds and
+asserts each plan reads its expected index with no Sort node::
+
+    python -m benchmarks.explain --out explain.json
+
+Exits non-zero when a plan does not match.
+"""
+import argparse
+import asyncio
+import sys
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.db import migrations
+from app.services.post import list_posts_stmt
+from app.services.post_purge import purge_batch_stmt
+import app.models.post  # noqa: F401
+import app.models.user  # noqa: F401
+
+from benchmarks.common import write_report
+from benchmarks.search import SEED_SQL
+
+AUTHOR_INDEX = "ix_post_author_id_created_at_desc"
+FEED_INDEX = "ix_post_created_at_id_live"
+PURGE_INDEX = "ix_post_deleted_updated_at"
+
+
+def plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def cases(author_id: int) -> dict:
+    after = (datetime.now(timezone.utc), uuid.uuid4())
+    return {
+        "author_first_page": (list_posts_stmt(None, 0, 20, author_id=author_id), AUTHOR_INDEX),
+        "author_cursor_page": (
+            list_posts_stmt(None, 0, 20, after=after, author_id=author_id),
+            AUTHOR_INDEX,
+        ),
+        "author_summary_page": (
+            list_posts_stmt(None, 0, 20, after=after, summary=True, author_id=author_id),
+            AUTHOR_INDEX,
+        ),
+        "global_cursor_page": (list_posts_stmt(None, 0, 20, after=after), FEED_INDEX),
+        "purge_batch": ((purge_batch_stmt(after[0], 500, after), None), PURGE_INDEX),
+    }
+
+
+async def explain(conn, stmt) -> dict:
+    compiled = stmt.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+    return result.scalar()[0]["Plan"]
+
+
+def check(plan: dict, index: str) -> tuple[bool, list[str]]:
+    nodes = list(plan_nodes(plan))
+    summary = [
+        f"{n['Node Type']} using {n['Index Name']}" if "Index Name" in n else n["Node Type"]
+        for n in nodes
+    ]
+    uses_index = any(
+        n["Node Type"] in ("Index Scan", "Index Only Scan") and n.get("Index Name") == index
+        for n in nodes
+    )
+    sorts = any(n["Node Type"] == "Sort" for n in nodes)
+    return uses_index and not sorts, summary
+
+
+async def main(args) -> dict:
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        connect_args={"server_settings": {"search_path": args.schema}},
+    )
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {args.schema} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {args.schema}"))
+    results = {}
+    try:
+        async with engine.begin() as conn:
+            await migrations.upgrade(conn)
+            author_ids = []
+            for i in range(args.authors):
+                author_id = await conn.scalar(
+                    text(
+                        "INSERT INTO users (fullname, email, password_hash) "
+                        "VALUES ('bench', :email, 'x') RETURNING id"
+                    ),
+                    {"email": f"explain-{i}@example.com"},
+                )
+                await conn.execute(
+                    text(SEED_SQL),
+                    {"author_id": author_id, "start": 1, "stop": args.posts_per_author},
+                )
+                author_ids.append(author_id)
+        async with engine.connect() as conn:
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("VACUUM ANALYZE posts"))
+            for name, ((stmt, _), index) in cases(author_ids[0]).items():
+                ok, nodes = check(await explain(conn, stmt), index)
+                results[name] = {"ok": ok, "expected_index": index, "plan": nodes}
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {args.schema} CASCADE"))
+        await engine.dispose()
+    return {
+        "benchmark": "explain",
+        "rows": args.authors * args.posts_per_author,
+        "ok": all(r["ok"] for r in results.values()),
+        "results": results,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--authors", type=int, default=200)
+    parser.add_argument("--posts-per-author", type=int, default=500)
+    parser.add_argument("--schema", default="bench_explain")
+    parser.add_argument("--out", help="write the JSON report here as well")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = asyncio.run(main(args))
+    write_report(report, args.out)
+    sys.exit(0 if report["ok"] else 1)
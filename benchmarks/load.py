@@ -0,0 +1,280 @@
+"""Drives the real FastAPI app in-process through load scenarios.
+
+Requests go through httpx's ASGI transport, so the whole middleware and
+dependency stack runs without a network listener. PostgreSQL comes from
+DATABASE_URL (use a throwaway local database). Redis is REDIS_URL, or an
+in-process fakeredis server with ``--redis fake``::
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.load --redis fake \\
+        --scenarios signup login_refresh hot_post pagination search --out load.json
+
+Reports throughput and p50/p95/p99 per endpoint and per scenario.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from collections import defaultdict
+
+import httpx
+from sqlalchemy import text
+
+from benchmarks.common import latency_summary, write_report
+from benchmarks.search import SEED_SQL
+
+PASSWORD = "bench-password"
+
+
+def use_fake_redis() -> None:
+    import fakeredis
+    from fakeredis.aioredis import FakeConnection
+
+    from app.core import redis_pool
+    from app.core.config import settings
+
+    server = fakeredis.FakeServer()
+
+    def create_pool():
+        return redis_pool.InstrumentedPool(
+            connection_class=FakeConnection,
+            server=server,
+            decode_responses=True,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+        )
+
+    redis_pool.create_pool = create_pool
+
+
+class Recorder:
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.bytes: dict[str, int] = defaultdict(int)
+
+    async def call(self, label: str, method: str, url: str, **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        self.samples[label].append((time.perf_counter() - start) * 1000)
+        self.statuses[label][response.status_code] += 1
+        self.bytes[label] += len(response.content)
+        return response
+
+    def report(self, elapsed_sec: float) -> dict:
+        return {
+            label: {
+                "throughput_rps": round(len(samples) / elapsed_sec, 1),
+                "statuses": dict(self.statuses[label]),
+                "mean_bytes": round(self.bytes[label] / len(samples)),
+                **latency_summary(samples),
+            }
+            for label, samples in self.samples.items()
+        }
+
+
+async def run_concurrently(concurrency: int, jobs: list) -> None:
+    queue: asyncio.Queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+
+    async def worker():
+        while not queue.empty():
+            job = queue.get_nowait()
+            await job()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def signup_users(rec: Recorder, count: int, concurrency: int) -> list[str]:
+    run_id = uuid.uuid4().hex[:8]
+    emails = [f"bench-{run_id}-{i}@example.com" for i in range(count)]
+
+    def job(email):
+        async def go():
+            await rec.call(
+                "POST /auth/signup",
+                "POST",
+                "/api/v1/auth/signup",
+                json={"email": email, "password": PASSWORD, "fullname": "Bench"},
+            )
+
+        return go
+
+    await run_concurrently(concurrency, [job(e) for e in emails])
+    return emails
+
+
+async def login(rec: Recorder, email: str) -> dict:
+    r = await rec.call(
+        "POST /auth/login",
+        "POST",
+        "/api/v1/auth/login",
+        json={"email": email, "password": PASSWORD, "return_refresh_in_body": True},
+    )
+    return r.json()
+
+
+async def scenario_signup(rec: Recorder, args) -> None:
+    await signup_users(rec, args.users, args.concurrency)
+
+
+async def scenario_login_refresh(rec: Recorder, args) -> None:
+    emails = await signup_users(Recorder(rec.client), args.users, args.concurrency)
+
+    def job(email):
+        async def go():
+            tokens = await login(rec, email)
+            refresh_token = tokens.get("refresh_token")
+            for _ in range(args.refreshes):
+                if not refresh_token:
+                    break
+                r = await rec.call(
+                    "POST /auth/refresh",
+                    "POST",
+                    "/api/v1/auth/refresh",
+                    json={"refresh_token": refresh_token, "return_refresh_in_body": True},
+                )
+                refresh_token = r.json().get("refresh_token")
+
+        return go
+
+    await run_concurrently(args.concurrency, [job(e) for e in emails])
+
+
+async def author_headers(client: httpx.AsyncClient) -> dict:
+    setup = Recorder(client)
+    (email,) = await signup_users(setup, 1, 1)
+    tokens = await login(setup, email)
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+async def scenario_hot_post(rec: Recorder, args) -> None:
+    headers = await author_headers(rec.client)
+    r = await rec.client.post(
+        "/api/v1/posts/",
+        json={"title": "hot post", "content": "x" * args.content_size},
+        headers=headers,
+    )
+    post_id = r.json()["id"]
+
+    def job():
+        async def go():
+            await rec.call("GET /posts/{id}", "GET", f"/api/v1/posts/{post_id}")
+
+        return go
+
+    await run_concurrently(args.concurrency, [job() for _ in range(args.requests)])
+
+
+async def seed_posts(rows: int) -> None:
+    from app.db.session import engine
+
+    async with engine.begin() as conn:
+        author_id = await conn.scalar(
+            text(
+                "INSERT INTO users (fullname, email, password_hash) "
+                "VALUES ('bench', :email, 'x') RETURNING id"
+            ),
+            {"email": f"bench-seed-{uuid.uuid4().hex[:8]}@example.com"},
+        )
+        await conn.execute(text(SEED_SQL), {"author_id": author_id, "start": 1, "stop": rows})
+        await conn.execute(text("ANALYZE posts"))
+
+
+async def scenario_pagination(rec: Recorder, args) -> None:
+    if args.seed_posts:
+        await seed_posts(args.seed_posts)
+    for depth in args.depths:
+        for _ in range(args.page_repeats):
+            await rec.call(
+                f"GET /posts?skip={depth}",
+                "GET",
+                "/api/v1/posts/",
+                params={"skip": depth, "limit": 100},
+            )
+    for view in ("full", "summary"):
+        for _ in range(args.page_repeats):
+            await rec.call(
+                f"GET /posts?view={view}",
+                "GET",
+                "/api/v1/posts/",
+                params={"view": view, "limit": 100},
+            )
+    cursor = ""
+    pages = max(args.depths) // 100 + 1
+    for _ in range(pages):
+        r = await rec.call(
+            "GET /posts?cursor", "GET", "/api/v1/posts/", params={"cursor": cursor, "limit": 100}
+        )
+        cursor = r.json().get("next_cursor")
+        if not cursor:
+            break
+
+
+async def scenario_search(rec: Recorder, args) -> None:
+    def job(q):
+        async def go():
+            await rec.call("GET /posts?q", "GET", "/api/v1/posts/", params={"q": q})
+
+        return go
+
+    jobs = [job(args.terms[i % len(args.terms)]) for i in range(args.requests)]
+    await run_concurrently(args.concurrency, jobs)
+
+
+SCENARIOS = {
+    "signup": scenario_signup,
+    "login_refresh": scenario_login_refresh,
+    "hot_post": scenario_hot_post,
+    "pagination": scenario_pagination,
+    "search": scenario_search,
+}
+
+
+async def main(args) -> dict:
+    if args.redis == "fake":
+        use_fake_redis()
+    from app.db import migrations
+    from app.db.session import engine
+    from app.main import app
+
+    async with engine.begin() as conn:
+        await migrations.upgrade(conn)
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=60
+        ) as client:
+            for name in args.scenarios:
+                rec = Recorder(client)
+                start = time.perf_counter()
+                await SCENARIOS[name](rec, args)
+                elapsed = time.perf_counter() - start
+                results[name] = {
+                    "elapsed_sec": round(elapsed, 3),
+                    "endpoints": rec.report(elapsed),
+                }
+    return {"suite": "load", "redis": args.redis, "scenarios": results}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=SCENARIOS)
+    parser.add_argument("--redis", default="url", choices=["url", "fake"])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=32)
+    parser.add_argument("--refreshes", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--content-size", type=int, default=4000)
+    parser.add_argument("--seed-posts", type=int, default=0, help="bulk-insert posts first")
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 1000, 10000])
+    parser.add_argument("--page-repeats", type=int, default=10)
+    parser.add_argument("--terms", nargs="+", default=["w17", "w4242", "w19999"])
+    parser.add_argument("--out", help="write the JSON report here as well")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    write_report(asyncio.run(main(args)), args.out)
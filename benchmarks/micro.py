@@ -0,0 +1,146 @@
+"""CPU microbenchmarks for request hot paths; no database or Redis needed.
+
+    python -m benchmarks.micro --out micro.json
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy.dialects import postgresql
+
+from app.core import compression
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.config import settings
+from app.core.responses import ORJSONResponse, dump_response
+from app.core.security import create_access_token, decode_token
+from app.models.post import Post
+from app.schemas.post import PostOut
+from app.services.post import list_posts_stmt
+import app.models.user  # noqa: F401
+
+from benchmarks.common import latency_summary, write_report
+
+
+def measure(fn, number: int, repeat: int) -> dict:
+    """Runs ``fn`` ``number`` times per round; reports per-call microseconds."""
+    fn()
+    per_call_us = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call_us.append((time.perf_counter() - start) / number * 1_000_000)
+    # latency_summary speaks milliseconds; relabel for microsecond samples.
+    summary = latency_summary(per_call_us)
+    return {
+        "calls": number * repeat,
+        **{k.replace("_ms", "_us"): v for k, v in summary.items() if k != "count"},
+    }
+
+
+def sample_posts(n: int, content_size: int) -> list[Post]:
+    now = datetime.now(timezone.utc)
+    return [
+        Post(
+            id=uuid.uuid4(),
+            author_id=1,
+            title=f"post {i}",
+            content="lorem ipsum " * (content_size // 12),
+            is_deleted=False,
+            created_at=now - timedelta(seconds=i),
+            updated_at=now - timedelta(seconds=i),
+        )
+        for i in range(n)
+    ]
+
+
+def run(args) -> dict:
+    results = {}
+
+    token = create_access_token("1")
+    results["create_access_token"] = measure(
+        lambda: create_access_token("1"), args.number, args.repeat
+    )
+    results["decode_token"] = measure(lambda: decode_token(token), args.number, args.repeat)
+
+    cursor = encode_cursor(datetime.now(timezone.utc), uuid.uuid4())
+    results["decode_cursor"] = measure(lambda: decode_cursor(cursor), args.number, args.repeat)
+
+    posts = sample_posts(args.page_size, args.content_size)
+    page_number = max(1, args.number // 50)
+
+    def fastapi_default():
+        # What FastAPI does for response_model=list[PostOut] with ORM rows.
+        items = [PostOut.model_validate(p) for p in posts]
+        return json.dumps(jsonable_encoder(items)).encode()
+
+    results[f"postout_page_{args.page_size}_jsonable_encoder"] = measure(
+        fastapi_default, page_number, args.repeat
+    )
+    results[f"postout_page_{args.page_size}_model_dump_json"] = measure(
+        lambda: [PostOut.model_validate(p).model_dump_json() for p in posts],
+        page_number,
+        args.repeat,
+    )
+    # FAST_JSON_RESPONSES: one validation pass, bytes straight from pydantic-core.
+    page_adapter = TypeAdapter(list[PostOut])
+    results[f"postout_page_{args.page_size}_fast_path"] = measure(
+        lambda: dump_response(page_adapter, posts).body, page_number, args.repeat
+    )
+    results[f"postout_page_{args.page_size}_jsonable_encoder_orjson"] = measure(
+        lambda: ORJSONResponse(
+            jsonable_encoder([PostOut.model_validate(p) for p in posts])
+        ).body,
+        page_number,
+        args.repeat,
+    )
+
+    page_body = dump_response(page_adapter, posts).body
+    for encoding in settings.COMPRESSION_ENCODINGS:
+        if compression.negotiate(encoding) != encoding:
+            continue  # optional library not installed
+        size = len(compression.compress(page_body, encoding))
+        results[f"compress_page_{args.page_size}_{encoding}"] = {
+            "ratio": round(len(page_body) / size, 1),
+            **measure(
+                lambda: compression.compress(page_body, encoding), page_number, args.repeat
+            ),
+        }
+
+    dialect = postgresql.asyncpg.dialect()
+    after = (datetime.now(timezone.utc), uuid.uuid4())
+    results["list_posts_stmt_build"] = measure(
+        lambda: list_posts_stmt(None, 0, 20), args.number, args.repeat
+    )
+    results["list_posts_stmt_compile_offset"] = measure(
+        lambda: list_posts_stmt(None, 0, 20)[0].compile(dialect=dialect),
+        args.number,
+        args.repeat,
+    )
+    results["list_posts_stmt_compile_cursor_search"] = measure(
+        lambda: list_posts_stmt("redis", 0, 20, after=after, ranked=False)[0].compile(
+            dialect=dialect
+        ),
+        args.number,
+        args.repeat,
+    )
+    return {"suite": "micro", "results": results}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="calls per round")
+    parser.add_argument("--repeat", type=int, default=5, help="rounds")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--content-size", type=int, default=2000, help="bytes per post")
+    parser.add_argument("--out", help="write the JSON report here as well")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    write_report(run(args), args.out)
@@ -0,0 +1,129 @@
+"""Search latency for GET /posts?q= at scale, per search backend.
+
+Seeds a throwaway schema with N posts (1M by default) and times the query
+that ``post_service.list_posts`` builds for each backend::
+
+    python -m benchmarks.search --rows 1000000 --out search.json
+
+``ilike`` is the old title-only substring match and serves as the baseline.
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.db import migrations
+from app.services import post as post_service
+import app.models.post  # noqa: F401
+import app.models.user  # noqa: F401
+
+from benchmarks.common import latency_summary, write_report
+
+SEED_SQL = """
+INSERT INTO posts (id, author_id, title, content, is_deleted, created_at, updated_at)
+SELECT
+    gen_random_uuid(),
+    :author_id,
+    'post ' || g || ' w' || floor(random() * 20000)::int,
+    array_to_string(
+        ARRAY(
+            SELECT 'w' || floor(random() * 20000)::int
+            FROM generate_series(1, 40)
+            WHERE g > 0
+        ),
+        ' '
+    ),
+    g % 20 = 0,
+    now() - g * interval '1 second',
+    now() - g * interval '1 second'
+FROM generate_series(CAST(:start AS int), CAST(:stop AS int)) AS g
+"""
+
+
+async def seed(engine, rows: int, batch: int, trgm: bool) -> None:
+    async with engine.begin() as conn:
+        await migrations.upgrade(conn)
+        author_id = await conn.scalar(
+            text(
+                "INSERT INTO users (fullname, email, password_hash) "
+                "VALUES ('bench', 'bench@example.com', 'x') RETURNING id"
+            )
+        )
+    for start in range(1, rows + 1, batch):
+        stop = min(start + batch - 1, rows)
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(SEED_SQL), {"author_id": author_id, "start": start, "stop": stop}
+            )
+    if trgm:
+        # upgrade() only creates these when the env already selects trgm;
+        # time_backend switches backends afterwards, so build them here.
+        async with engine.begin() as conn:
+            for statement in migrations.TRGM_STATEMENTS:
+                await conn.execute(text(statement))
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE posts"))
+
+
+async def time_backend(engine, backend: str, terms: list[str], repeat: int) -> dict:
+    settings.POSTS_SEARCH_BACKEND = backend
+    samples = []
+    async with AsyncSession(engine) as db:
+        for _ in range(repeat):
+            for q in terms:
+                start = time.perf_counter()
+                await post_service.list_posts(db, q, 0, 20)
+                samples.append((time.perf_counter() - start) * 1000)
+    return {"backend": backend, **latency_summary(samples)}
+
+
+async def main(args) -> dict:
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        connect_args={"server_settings": {"search_path": args.schema}},
+    )
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {args.schema} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {args.schema}"))
+    try:
+        start = time.perf_counter()
+        await seed(engine, args.rows, args.batch, "trgm" in args.backends)
+        seed_sec = time.perf_counter() - start
+        results = [
+            await time_backend(engine, backend, args.terms, args.repeat)
+            for backend in args.backends
+        ]
+    finally:
+        if not args.keep:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"DROP SCHEMA IF EXISTS {args.schema} CASCADE"))
+        await engine.dispose()
+    return {
+        "benchmark": "posts_search",
+        "rows": args.rows,
+        "seed_sec": round(seed_sec, 1),
+        "terms": args.terms,
+        "results": results,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--schema", default="bench_search")
+    parser.add_argument("--backends", nargs="+", default=["ilike", "fts"])
+    parser.add_argument("--terms", nargs="+", default=["w17", "w4242", "w19999"])
+    parser.add_argument("--keep", action="store_true", help="keep the seeded schema")
+    parser.add_argument("--out", help="write the JSON report here as well")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    write_report(asyncio.run(main(args)), args.out)
@@ -0,0 +1,97 @@
+"""Worker startup: time from launching the server to serving requests.
+
+Starts ``uvicorn app.main:app`` as a subprocess against DATABASE_URL and
+REDIS_URL, polls GET / until it answers, then times the first
+GET /api/v1/posts/ and reads the worker's startup phases from /metrics.
+Each run is repeated with warm-up on and off::
+
+    python -m app.db.migrations
+    python -m benchmarks.startup --workers 4 --runs 5 --out startup.json
+
+With several workers, / and /metrics may be answered by different workers.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import Timer, latency_summary, write_report
+
+STARTUP_METRICS = ("app_startup_phase_seconds", "app_time_to_first_request_seconds")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def startup_metrics(text: str) -> dict:
+    values = {}
+    for line in text.splitlines():
+        if line.startswith(STARTUP_METRICS):
+            name, _, value = line.rpartition(" ")
+            values[name] = round(float(value), 3)
+    return values
+
+
+def run_once(args, warmup: bool) -> dict:
+    port = free_port()
+    env = {**os.environ, "WARMUP_ENABLED": str(warmup).lower()}
+    cmd = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(args.workers), "--log-level", "warning",
+    ]
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, env=env)
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=10) as client:
+            while True:
+                if proc.poll() is not None:
+                    raise RuntimeError(f"server exited with {proc.returncode}")
+                if time.perf_counter() - start > args.timeout:
+                    raise RuntimeError("server did not become ready")
+                try:
+                    if client.get("/").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.01)
+            ready_ms = (time.perf_counter() - start) * 1000
+            with Timer() as first:
+                client.get("/api/v1/posts/", params={"limit": 20}).raise_for_status()
+            metrics = startup_metrics(client.get("/metrics").text)
+    finally:
+        proc.terminate()
+        proc.wait()
+    return {"ready_ms": ready_ms, "first_list_ms": first.ms, "metrics": metrics}
+
+
+def main(args) -> dict:
+    modes = {}
+    for warmup in (True, False):
+        runs = [run_once(args, warmup) for _ in range(args.runs)]
+        modes["warmup" if warmup else "no_warmup"] = {
+            "ready": latency_summary([r["ready_ms"] for r in runs]),
+            "first_list_request": latency_summary([r["first_list_ms"] for r in runs]),
+            "last_run_metrics": runs[-1]["metrics"],
+        }
+    return {"suite": "startup", "workers": args.workers, "runs": args.runs, "modes": modes}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--out", help="write the JSON report here as well")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    write_report(main(args), args.out)
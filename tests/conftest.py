@@ -0,0 +1,5 @@
+import os
+
+# Settings requires these; tests never connect to them.
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://test@localhost/test")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
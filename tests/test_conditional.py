@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+
+import pytest
+from starlette.requests import Request
+
+from app.core.conditional import is_not_modified
+
+UPDATED_AT = datetime(2026, 10, 18, 9, 1, 4, 250000, tzinfo=timezone.utc)
+
+
+def _request(if_modified_since: str) -> Request:
+    headers = [(b"if-modified-since", if_modified_since.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("Sun, 18 Oct 2026 09:01:04 GMT", True),
+        ("Sun, 18 Oct 2026 09:01:04 -0000", True),
+        ("Sun Oct 18 09:01:04 2026", True),
+        ("Sun Nov  6 08:49:37 1994", False),
+        ("Sunday, 06-Nov-94 08:49:37 GMT", False),
+        ("Sun, 18 Oct 2026 11:01:04 +0200", True),
+        ("not a date", False),
+    ],
+)
+def test_if_modified_since_forms(header, expected):
+    assert is_not_modified(_request(header), 'W/"x"', UPDATED_AT) is expected
@@ -0,0 +1,93 @@
+import fakeredis
+import pytest
+
+from app.services import refresh_store
+
+TTL = 3600
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def r():
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+async def _login(r, jti="a", user_id="1"):
+    await refresh_store.save_refresh(r, jti, user_id, TTL, family_id=jti)
+
+
+async def _rotate(r, old, new, family="a", user_id="1"):
+    return await refresh_store.rotate_refresh(r, old, new, user_id, family, TTL)
+
+
+@pytest.mark.anyio
+async def test_rotate_moves_session_and_family(r):
+    await _login(r)
+    assert await _rotate(r, "a", "b") == refresh_store.ROTATED
+    assert not await r.exists("rt:a")
+    assert await r.exists("rt:b")
+    assert await r.exists("rtu:a")
+    assert await r.get("rtf:a") == "b"
+    assert await r.zrange("rts:1", 0, -1) == ["b"]
+
+
+@pytest.mark.anyio
+async def test_rotate_unknown_token_is_invalid(r):
+    assert await _rotate(r, "missing", "b", family="missing") == refresh_store.INVALID
+    assert not await r.exists("rt:b")
+
+
+@pytest.mark.anyio
+async def test_reuse_revokes_current_session(r):
+    await _login(r)
+    await _rotate(r, "a", "b")
+    await _rotate(r, "b", "c")
+    assert await _rotate(r, "a", "x") == refresh_store.REUSED
+    assert not await r.exists("rt:x")
+    assert not await r.exists("rt:c")
+    assert not await r.exists("rtf:a")
+    assert await r.zrange("rts:1", 0, -1) == []
+    # The revoked current token cannot be rotated either.
+    assert await _rotate(r, "c", "y") == refresh_store.INVALID
+
+
+@pytest.mark.anyio
+async def test_family_revocation_retries_when_family_moves_on(r, monkeypatch):
+    await _login(r)
+    await _rotate(r, "a", "b")
+    await _rotate(r, "b", "c")
+    # First read returns a jti the family has already rotated away from, as if
+    # a rotation landed between the read and the script.
+    real_get = r.get
+    reads = []
+
+    async def get(key):
+        reads.append(key)
+        return "b" if len(reads) == 1 else await real_get(key)
+
+    monkeypatch.setattr(r, "get", get)
+    await refresh_store._revoke_family(r, "a", "1")
+    assert len(reads) == 2
+    assert not await r.exists("rt:c")
+    assert not await r.exists("rtf:a")
+
+
+@pytest.mark.anyio
+async def test_logout_all_refuses_sessions_missing_from_index(r):
+    await _login(r)
+    # Stored before the per-user index existed: no iat, not in rts:1.
+    await r.set("rt:legacy", '{"uid": "1"}', ex=TTL)
+    revoked = await refresh_store.revoke_sessions(r, "1", TTL)
+    assert [s["jti"] for s in revoked] == ["a"]
+    assert await _rotate(r, "legacy", "x", family="legacy") == refresh_store.REVOKED
+    assert not await r.exists("rt:legacy")
+    assert not await r.exists("rt:x")
+    # Sessions started after the logout-all rotate as usual.
+    await _login(r, "b")
+    assert await _rotate(r, "b", "c", family="b") == refresh_store.ROTATED